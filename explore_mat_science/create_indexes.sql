@@ -0,0 +1,53 @@
+-- ============================================================================
+-- MIGRATION: Covering indexes for the field / year filter, plus trigram
+-- indexes for the topic name / keyword searches
+-- ============================================================================
+-- Run this in psql (or any client in autocommit mode).
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+-- Safe to re-run: every statement is IF NOT EXISTS.
+-- ============================================================================
+
+-- Year filter on works, carrying id/type so the scan is index-only
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_works_year_incl_id_type
+    ON openalex.works (publication_year) INCLUDE (id, type);
+
+-- Topic -> work direction of works_topics (the pkey leads with work_id)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_works_topics_topic_work
+    ON openalex.works_topics (topic_id, work_id);
+
+-- Field filter on topics, carrying the subfield columns used in breakdowns
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_topics_field_incl_subfield
+    ON openalex.topics (field_id) INCLUDE (id, subfield_id, subfield_display_name);
+
+-- Trigram indexes for the ILIKE ANY (ARRAY['%...%', ...]) name/keyword
+-- filters in explore_topics.py; a leading wildcard cannot use a btree
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_topics_domain_trgm
+    ON openalex.topics USING GIN (domain_display_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_topics_field_trgm
+    ON openalex.topics USING GIN (field_display_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_topics_subfield_trgm
+    ON openalex.topics USING GIN (subfield_display_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_topics_keywords_trgm
+    ON openalex.topics USING GIN (keywords gin_trgm_ops);
+
+ANALYZE openalex.works;
+ANALYZE openalex.works_topics;
+ANALYZE openalex.topics;
+
+-- ============================================================================
+-- VERIFY
+-- ============================================================================
+-- Expect "Index Only Scan using idx_works_year_incl_id_type" for the year
+-- filter and idx_works_topics_topic_work (not works_topics_pkey) for the join
+-- EXPLAIN (ANALYZE, BUFFERS)
+-- SELECT COUNT(*)
+-- FROM openalex.works w
+-- JOIN openalex.works_topics wt ON w.id = wt.work_id
+-- JOIN openalex.topics t ON wt.topic_id = t.id
+-- WHERE t.field_id = 'https://openalex.org/fields/25'
+--   AND w.publication_year = 2024;
@@ -0,0 +1,43 @@
+-- ============================================================================
+-- BOOTSTRAP: Pre-joined 2024 Material Science view
+-- ============================================================================
+-- Run this once in your SQL client (pgAdmin, DBeaver, psql, etc.)
+-- Field ID: https://openalex.org/fields/25 (Materials Science)
+-- Year: 2024
+--
+-- Every size/breakdown query repeats the same
+--   works JOIN works_topics JOIN topics WHERE field_id = ... AND year = 2024
+-- join. This view persists that join once so later queries scan it directly.
+-- ============================================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS openalex.mv_mat_sci_2024 AS
+SELECT
+    w.id AS work_id,
+    w.type,
+    t.subfield_id,
+    t.subfield_display_name,
+    t.id AS topic_id,
+    t.display_name AS topic_name
+FROM openalex.works w
+JOIN openalex.works_topics wt ON w.id = wt.work_id
+JOIN openalex.topics t ON wt.topic_id = t.id
+WHERE t.field_id = 'https://openalex.org/fields/25'
+  AND w.publication_year = 2024;
+
+-- Unique index (also required for REFRESH ... CONCURRENTLY)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_mat_sci_2024_work_topic
+    ON openalex.mv_mat_sci_2024 (work_id, topic_id);
+
+-- Breakdown indexes
+CREATE INDEX IF NOT EXISTS idx_mv_mat_sci_2024_subfield
+    ON openalex.mv_mat_sci_2024 (subfield_id);
+CREATE INDEX IF NOT EXISTS idx_mv_mat_sci_2024_type
+    ON openalex.mv_mat_sci_2024 (type);
+
+ANALYZE openalex.mv_mat_sci_2024;
+
+-- ============================================================================
+-- REFRESH (after new OpenAlex data is loaded)
+-- ============================================================================
+-- Readers are not blocked while the view is rebuilt
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY openalex.mv_mat_sci_2024;
@@ -0,0 +1,76 @@
+"""
+Shared Database Connections
+===========================
+Connection pools shared by the exploration scripts, so a run reuses warm
+backends instead of paying connect + auth for every query.
+
+Requirements:
+- psycopg[binary]
+- psycopg-pool
+- python-dotenv
+- .env file with database credentials
+"""
+
+import atexit
+import os
+from dotenv import load_dotenv
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+# Load environment variables
+load_dotenv()
+
+# Database connection parameters
+DB_PARAMS = {
+    'dbname': os.getenv('DB_NAME'),
+    'user': os.getenv('DB_USER'),
+    'password': os.getenv('DB_PASSWORD'),
+    'host': os.getenv('DB_HOST'),
+    'port': os.getenv('DB_PORT')
+}
+
+CONNINFO = make_conninfo(**DB_PARAMS)
+
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 8
+
+_pool = None
+
+def get_pool():
+    """Return the process-wide pool, opening it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            conninfo=CONNINFO,
+            min_size=POOL_MIN_SIZE,
+            max_size=POOL_MAX_SIZE,
+            kwargs={'row_factory': tuple_row},
+            open=True
+        )
+        atexit.register(_pool.close)
+    return _pool
+
+def get_connection():
+    """
+    Borrow a connection from the shared pool.
+
+    Use as a context manager; the connection is committed (or rolled back
+    on error) and returned to the pool on exit.
+    """
+    return get_pool().connection()
+
+def get_async_pool():
+    """
+    Create an async pool for use with `async with`.
+
+    Async pools are bound to the running event loop, so callers open one
+    inside asyncio.run() rather than sharing a module-level instance.
+    """
+    return AsyncConnectionPool(
+        conninfo=CONNINFO,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        kwargs={'row_factory': tuple_row},
+        open=False
+    )
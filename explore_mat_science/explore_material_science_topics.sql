@@ -28,10 +28,7 @@ SELECT DISTINCT
     domain_display_name,
     COUNT(*) as topic_count
 FROM openalex.topics
-WHERE domain_display_name ILIKE '%material%'
-   OR domain_display_name ILIKE '%physical%'
-   OR domain_display_name ILIKE '%engineering%'
-   OR domain_display_name ILIKE '%chemistry%'
+WHERE domain_display_name ILIKE ANY (ARRAY['%material%', '%physical%', '%engineering%', '%chemistry%'])
 GROUP BY domain_id, domain_display_name
 ORDER BY domain_display_name;
 
@@ -45,8 +42,7 @@ SELECT DISTINCT
     domain_display_name,
     COUNT(*) as topic_count
 FROM openalex.topics
-WHERE domain_display_name ILIKE '%physical%'
-   OR domain_display_name ILIKE '%engineering%'
+WHERE domain_display_name ILIKE ANY (ARRAY['%physical%', '%engineering%'])
 GROUP BY field_id, field_display_name, domain_display_name
 ORDER BY domain_display_name, field_display_name;
 
@@ -61,11 +57,7 @@ SELECT DISTINCT
     COUNT(*) as topic_count,
     SUM(works_count) as total_works
 FROM openalex.topics
-WHERE field_display_name ILIKE '%material%'
-   OR field_display_name ILIKE '%metallurg%'
-   OR field_display_name ILIKE '%ceramic%'
-   OR field_display_name ILIKE '%polymer%'
-   OR field_display_name ILIKE '%composite%'
+WHERE field_display_name ILIKE ANY (ARRAY['%material%', '%metallurg%', '%ceramic%', '%polymer%', '%composite%'])
 GROUP BY field_id, field_display_name, domain_display_name
 ORDER BY total_works DESC;
 
@@ -73,6 +65,22 @@ ORDER BY total_works DESC;
 -- QUERY 5: Explore Subfields Related to Materials
 -- ----------------------------------------------------------------------------
 -- Get subfields that are material science related
+-- One trigram-index lookup per pattern; UNION dedups topics matching several
+WITH matched_topics AS (
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%material%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%metallurg%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%ceramic%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%polymer%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%composite%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%crystal%'
+    UNION
+    SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%solid state%'
+)
 SELECT DISTINCT
     subfield_id,
     subfield_display_name,
@@ -81,13 +89,7 @@ SELECT DISTINCT
     COUNT(*) as topic_count,
     SUM(works_count) as total_works
 FROM openalex.topics
-WHERE subfield_display_name ILIKE '%material%'
-   OR subfield_display_name ILIKE '%metallurg%'
-   OR subfield_display_name ILIKE '%ceramic%'
-   OR subfield_display_name ILIKE '%polymer%'
-   OR subfield_display_name ILIKE '%composite%'
-   OR subfield_display_name ILIKE '%crystal%'
-   OR subfield_display_name ILIKE '%solid state%'
+WHERE id IN (SELECT id FROM matched_topics)
 GROUP BY subfield_id, subfield_display_name, field_display_name, domain_display_name
 ORDER BY total_works DESC;
 
@@ -123,14 +125,7 @@ SELECT
     keywords,
     works_count
 FROM openalex.topics
-WHERE keywords ILIKE '%metal%'
-   OR keywords ILIKE '%alloy%'
-   OR keywords ILIKE '%ceramic%'
-   OR keywords ILIKE '%polymer%'
-   OR keywords ILIKE '%crystal%'
-   OR keywords ILIKE '%semiconductor%'
-   OR keywords ILIKE '%composite%'
-   OR keywords ILIKE '%nanomaterial%'
+WHERE keywords ILIKE ANY (ARRAY['%metal%', '%alloy%', '%ceramic%', '%polymer%', '%crystal%', '%semiconductor%', '%composite%', '%nanomaterial%'])
 ORDER BY works_count DESC
 LIMIT 100;
 
@@ -152,8 +147,7 @@ SELECT
     t.description,
     t.keywords
 FROM openalex.topics t
-WHERE t.field_display_name ILIKE '%material%'
-   OR t.field_display_name ILIKE '%engineering%'
+WHERE t.field_display_name ILIKE ANY (ARRAY['%material%', '%engineering%'])
 ORDER BY t.field_display_name, t.subfield_display_name, t.works_count DESC;
 
 -- ----------------------------------------------------------------------------
@@ -168,8 +162,7 @@ SELECT
     AVG(works_count) as avg_works_per_topic,
     SUM(cited_by_count) as total_citations
 FROM openalex.topics
-WHERE field_display_name ILIKE '%material%'
-   OR field_display_name ILIKE '%engineering%'
+WHERE field_display_name ILIKE ANY (ARRAY['%material%', '%engineering%'])
    OR subfield_display_name ILIKE '%material%'
 GROUP BY field_display_name, domain_display_name
 ORDER BY total_works DESC;
@@ -6,17 +6,22 @@ Saves results to CSV files for analysis.
 
 Requirements:
 - psycopg[binary]
+- psycopg-pool
 - python-dotenv
 - pandas
+- zstandard (optional, for --zstd)
 - .env file with database credentials
 """
 
-import psycopg
-import pandas as pd
+import argparse
+import asyncio
+import hashlib
+import json
 import os
-from dotenv import load_dotenv
+import sys
 from pathlib import Path
 import logging
+from db import get_async_pool
 
 # Configure logging
 logging.basicConfig(
@@ -25,70 +30,148 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-# Database connection parameters
-DB_PARAMS = {
-    'dbname': os.getenv('DB_NAME'),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD'),
-    'host': os.getenv('DB_HOST'),
-    'port': os.getenv('DB_PORT')
-}
-
 # Output directory
 OUTPUT_DIR = Path('explore_mat_science/results')
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def get_connection():
-    """Create and return a database connection."""
+pd = None
+
+def _pd():
+    """Import pandas on first use; it is only needed once results are read back."""
+    global pd
+    if pd is None:
+        import pandas as pd
+    return pd
+
+# Maps output file name -> hash of the SQL that produced it; keyed by file
+# rather than query_name, so the .csv and .csv.zst of one query are cached
+# separately
+CACHE_MANIFEST = OUTPUT_DIR / 'query_cache.json'
+
+def query_key(sql_query):
+    """Short content hash of a query's SQL text."""
+    return hashlib.sha1(sql_query.encode()).hexdigest()[:12]
+
+def load_cache_manifest():
+    """Load the query cache manifest, or an empty one if it doesn't exist."""
     try:
-        conn = psycopg.connect(**DB_PARAMS)
-        logger.info("Database connection established")
-        return conn
-    except Exception as e:
-        logger.error(f"Failed to connect to database: {e}")
-        raise
+        with open(CACHE_MANIFEST) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def result_path(query_name, compress=False):
+    """Path of a query's CSV output (zstd-compressed when compress is set)."""
+    suffix = '.csv.zst' if compress else '.csv'
+    return OUTPUT_DIR / f"{query_name}{suffix}"
 
-def execute_query(conn, query_name, sql_query):
+def save_cache_manifest(manifest):
+    """Write the query cache manifest."""
+    with open(CACHE_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+async def execute_query(pool, query_name, sql_query, compress=False):
     """
-    Execute a SQL query and save results to CSV.
+    Execute a SQL query on a pooled connection and save results to CSV.
+    
+    Each query borrows its own connection so the queries can run on
+    separate backends at the same time; connections are never shared
+    between coroutines.
     
     Parameters:
-    - conn: database connection
+    - pool: open AsyncConnectionPool
     - query_name: name for the output file
     - sql_query: SQL query string
+    - compress: write {query_name}.csv.zst instead of plain CSV
     """
+    # Written under a temporary name and moved into place once COPY finishes,
+    # so a failed query never leaves a partial CSV for the cache to serve
+    output_file = result_path(query_name, compress)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
     try:
         logger.info(f"Executing query: {query_name}")
         
-        # Execute query and load into DataFrame
-        df = pd.read_sql_query(sql_query, conn)
+        # Stream the result straight to CSV with COPY; the server formats
+        # the rows, so no per-row Python objects are built on the way
+        copy_sql = f"COPY ({sql_query.strip().rstrip(';')}) TO STDOUT WITH (FORMAT CSV, HEADER)"
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                async with cur.copy(copy_sql) as copy:
+                    with open(tmp_file, 'wb') as raw:
+                        if compress:
+                            import zstandard
+                            f = zstandard.ZstdCompressor(level=3).stream_writer(raw)
+                        else:
+                            f = raw
+                        with f:
+                            async for data in copy:
+                                f.write(data)
+        os.replace(tmp_file, output_file)
         
-        # Save to CSV
-        output_file = OUTPUT_DIR / f"{query_name}.csv"
-        df.to_csv(output_file, index=False)
+        # Load the CSV back for the preview and summary report
+        # (pandas infers zstd from the .zst suffix)
+        df = _pd().read_csv(output_file)
         
         logger.info(f"✓ Query completed: {len(df)} rows → {output_file}")
         
-        # Print preview
-        print(f"\n{'='*80}")
-        print(f"Query: {query_name}")
-        print(f"{'='*80}")
-        print(df.head(10).to_string())
-        print(f"\nTotal rows: {len(df)}")
-        print(f"{'='*80}\n")
-        
         return df
         
     except Exception as e:
         logger.error(f"Error executing {query_name}: {e}")
+        tmp_file.unlink(missing_ok=True)
         return None
 
+async def run_queries(queries, force=False, compress=False):
+    """
+    Run all queries concurrently and return {query_name: DataFrame or None}.
+    
+    A query whose SQL is unchanged since its CSV was written is read back
+    from disk instead of re-run, unless force is set.
+    """
+    manifest = load_cache_manifest()
+    results = {}
+    pending = {}
+    for query_name, sql in queries.items():
+        output_file = result_path(query_name, compress)
+        if not force and manifest.get(output_file.name) == query_key(sql) and output_file.exists():
+            logger.info(f"Using cached result: {query_name}")
+            results[query_name] = _pd().read_csv(output_file)
+        else:
+            pending[query_name] = sql
+    
+    if pending:
+        async with get_async_pool() as pool:
+            logger.info("Database connection pool opened")
+            dfs = await asyncio.gather(
+                *(execute_query(pool, query_name, sql, compress) for query_name, sql in pending.items())
+            )
+        for query_name, df in zip(pending, dfs):
+            results[query_name] = df
+            if df is not None:
+                manifest[result_path(query_name, compress).name] = query_key(pending[query_name])
+        save_cache_manifest(manifest)
+    
+    return {query_name: results[query_name] for query_name in queries}
+
+def print_preview(query_name, df):
+    """Print the first rows of a query result."""
+    print(f"\n{'='*80}")
+    print(f"Query: {query_name}")
+    print(f"{'='*80}")
+    print(df.head(10).to_string())
+    print(f"\nTotal rows: {len(df)}")
+    print(f"{'='*80}\n")
+
 def main():
     """Main execution function."""
     
+    parser = argparse.ArgumentParser(description="Run the Material Science topic exploration queries.")
+    parser.add_argument('--force', action='store_true',
+                        help="re-run every query even if its cached CSV is up to date")
+    parser.add_argument('--zstd', action='store_true',
+                        help="write zstd-compressed {query_name}.csv.zst files")
+    args = parser.parse_args()
+    
     # SQL Queries
     queries = {
         '01_domain_overview': """
@@ -108,10 +191,7 @@ def main():
                 domain_display_name,
                 COUNT(*) as topic_count
             FROM openalex.topics
-            WHERE domain_display_name ILIKE '%material%'
-               OR domain_display_name ILIKE '%physical%'
-               OR domain_display_name ILIKE '%engineering%'
-               OR domain_display_name ILIKE '%chemistry%'
+            WHERE domain_display_name ILIKE ANY (ARRAY['%material%', '%physical%', '%engineering%', '%chemistry%'])
             GROUP BY domain_id, domain_display_name
             ORDER BY domain_display_name;
         """,
@@ -123,8 +203,7 @@ def main():
                 domain_display_name,
                 COUNT(*) as topic_count
             FROM openalex.topics
-            WHERE domain_display_name ILIKE '%physical%'
-               OR domain_display_name ILIKE '%engineering%'
+            WHERE domain_display_name ILIKE ANY (ARRAY['%physical%', '%engineering%'])
             GROUP BY field_id, field_display_name, domain_display_name
             ORDER BY domain_display_name, field_display_name;
         """,
@@ -137,16 +216,28 @@ def main():
                 COUNT(*) as topic_count,
                 SUM(works_count) as total_works
             FROM openalex.topics
-            WHERE field_display_name ILIKE '%material%'
-               OR field_display_name ILIKE '%metallurg%'
-               OR field_display_name ILIKE '%ceramic%'
-               OR field_display_name ILIKE '%polymer%'
-               OR field_display_name ILIKE '%composite%'
+            WHERE field_display_name ILIKE ANY (ARRAY['%material%', '%metallurg%', '%ceramic%', '%polymer%', '%composite%'])
             GROUP BY field_id, field_display_name, domain_display_name
             ORDER BY total_works DESC;
         """,
         
         '05_material_subfields': """
+            -- One trigram-index lookup per pattern; UNION dedups topics matching several
+            WITH matched_topics AS (
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%material%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%metallurg%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%ceramic%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%polymer%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%composite%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%crystal%'
+                UNION
+                SELECT id FROM openalex.topics WHERE subfield_display_name ILIKE '%solid state%'
+            )
             SELECT DISTINCT
                 subfield_id,
                 subfield_display_name,
@@ -155,13 +246,7 @@ def main():
                 COUNT(*) as topic_count,
                 SUM(works_count) as total_works
             FROM openalex.topics
-            WHERE subfield_display_name ILIKE '%material%'
-               OR subfield_display_name ILIKE '%metallurg%'
-               OR subfield_display_name ILIKE '%ceramic%'
-               OR subfield_display_name ILIKE '%polymer%'
-               OR subfield_display_name ILIKE '%composite%'
-               OR subfield_display_name ILIKE '%crystal%'
-               OR subfield_display_name ILIKE '%solid state%'
+            WHERE id IN (SELECT id FROM matched_topics)
             GROUP BY subfield_id, subfield_display_name, field_display_name, domain_display_name
             ORDER BY total_works DESC;
         """,
@@ -193,14 +278,7 @@ def main():
                 keywords,
                 works_count
             FROM openalex.topics
-            WHERE keywords ILIKE '%metal%'
-               OR keywords ILIKE '%alloy%'
-               OR keywords ILIKE '%ceramic%'
-               OR keywords ILIKE '%polymer%'
-               OR keywords ILIKE '%crystal%'
-               OR keywords ILIKE '%semiconductor%'
-               OR keywords ILIKE '%composite%'
-               OR keywords ILIKE '%nanomaterial%'
+            WHERE keywords ILIKE ANY (ARRAY['%metal%', '%alloy%', '%ceramic%', '%polymer%', '%crystal%', '%semiconductor%', '%composite%', '%nanomaterial%'])
             ORDER BY works_count DESC
             LIMIT 100;
         """,
@@ -214,8 +292,7 @@ def main():
                 AVG(works_count) as avg_works_per_topic,
                 SUM(cited_by_count) as total_citations
             FROM openalex.topics
-            WHERE field_display_name ILIKE '%material%'
-               OR field_display_name ILIKE '%engineering%'
+            WHERE field_display_name ILIKE ANY (ARRAY['%material%', '%engineering%'])
                OR subfield_display_name ILIKE '%material%'
             GROUP BY field_display_name, domain_display_name
             ORDER BY total_works DESC;
@@ -234,33 +311,29 @@ def main():
         """
     }
     
-    # Connect to database
-    conn = get_connection()
+    # Windows' default Proactor loop is not supported by psycopg async
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     
-    try:
-        # Execute all queries
-        results = {}
-        for query_name, sql in queries.items():
-            df = execute_query(conn, query_name, sql)
-            if df is not None:
-                results[query_name] = df
-        
-        # Generate summary
-        logger.info("\n" + "="*80)
-        logger.info("EXPLORATION SUMMARY")
-        logger.info("="*80)
-        for name, df in results.items():
-            logger.info(f"{name}: {len(df)} rows")
-        
-        logger.info(f"\n✓ All results saved to: {OUTPUT_DIR}")
-        logger.info("="*80)
-        
-        # Create a summary report
-        create_summary_report(results)
-        
-    finally:
-        conn.close()
-        logger.info("Database connection closed")
+    # Execute all queries concurrently (one pooled connection per query)
+    results = {}
+    for query_name, df in asyncio.run(run_queries(queries, force=args.force, compress=args.zstd)).items():
+        if df is not None:
+            print_preview(query_name, df)
+            results[query_name] = df
+    
+    # Generate summary
+    logger.info("\n" + "="*80)
+    logger.info("EXPLORATION SUMMARY")
+    logger.info("="*80)
+    for name, df in results.items():
+        logger.info(f"{name}: {len(df)} rows")
+    
+    logger.info(f"\n✓ All results saved to: {OUTPUT_DIR}")
+    logger.info("="*80)
+    
+    # Create a summary report
+    create_summary_report(results)
 
 def create_summary_report(results):
     """Create a text summary report of the exploration."""
@@ -277,7 +350,7 @@ def create_summary_report(results):
             f.write("AVAILABLE DOMAINS:\n")
             f.write("-" * 80 + "\n")
             df = results['01_domain_overview']
-            f.write(df.to_string(index=False))
+            df.to_string(buf=f, index=False)
             f.write("\n\n")
         
         # Material-related domains
@@ -285,7 +358,7 @@ def create_summary_report(results):
             f.write("MATERIAL-RELATED DOMAINS:\n")
             f.write("-" * 80 + "\n")
             df = results['02_material_domains']
-            f.write(df.to_string(index=False))
+            df.to_string(buf=f, index=False)
             f.write("\n\n")
         
         # Material fields
@@ -293,7 +366,7 @@ def create_summary_report(results):
             f.write("MATERIAL SCIENCE FIELDS:\n")
             f.write("-" * 80 + "\n")
             df = results['04_material_fields']
-            f.write(df.to_string(index=False))
+            df.to_string(buf=f, index=False)
             f.write("\n\n")
             
             # Calculate total works
@@ -305,7 +378,7 @@ def create_summary_report(results):
             f.write("WORK COUNT SUMMARY BY FIELD:\n")
             f.write("-" * 80 + "\n")
             df = results['08_work_counts_by_field']
-            f.write(df.to_string(index=False))
+            df.to_string(buf=f, index=False)
             f.write("\n\n")
         
         f.write("="*80 + "\n")
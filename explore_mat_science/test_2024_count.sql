@@ -32,6 +32,13 @@ WHERE t.field_id = 'https://openalex.org/fields/25'
 --       AND t.field_id = 'https://openalex.org/fields/25'
 --   );
 
+-- ============================================================================
+-- ALTERNATIVE QUERY 1B: Pre-joined materialized view
+-- ============================================================================
+-- Fastest once create_mat_sci_2024_view.sql has been run
+-- SELECT COUNT(*) as total_2024_works
+-- FROM openalex.mv_mat_sci_2024;
+
 -- ============================================================================
 -- ALTERNATIVE QUERY 2: Sample first (to verify query works)
 -- ============================================================================
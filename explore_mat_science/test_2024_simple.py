@@ -4,35 +4,31 @@ Simple 2024 Material Science Size Test
 Quick test to see how many 2024 Material Science works exist.
 """
 
-import psycopg
-import os
-from dotenv import load_dotenv
+from db import get_connection
 
-# Load environment variables
-load_dotenv()
-
-# Database connection
-DB_PARAMS = {
-    'dbname': os.getenv('DB_NAME'),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD'),
-    'host': os.getenv('DB_HOST'),
-    'port': os.getenv('DB_PORT')
-}
+# Pre-joined field 25 / 2024 view (see create_mat_sci_2024_view.sql)
+MAT_SCI_VIEW = 'openalex.mv_mat_sci_2024'
 
 def test_connection():
-    """Test if we can connect to the database."""
+    """Test if we can get a connection from the shared pool."""
     try:
-        conn = psycopg.connect(**DB_PARAMS)
+        with get_connection() as conn:
+            conn.execute("SELECT 1")
         print("✓ Database connection successful!")
-        return conn
+        return True
     except Exception as e:
         print(f"✗ Connection failed: {e}")
-        return None
+        return False
+
+def has_mat_sci_view(conn):
+    """Check whether the pre-joined view from create_mat_sci_2024_view.sql exists."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", (MAT_SCI_VIEW,))
+        return cur.fetchone()[0] is not None
 
 def quick_count(conn):
     """Get a quick count of 2024 Material Science works."""
-    
+
     # Simple query - just count
     query = """
         SELECT COUNT(*) as total_count
@@ -42,8 +38,13 @@ def quick_count(conn):
         WHERE t.field_id = 'https://openalex.org/fields/25'
           AND w.publication_year = 2024;
     """
-    
+
     try:
+        # Scan the materialized view instead of re-running the join
+        if has_mat_sci_view(conn):
+            print(f"\nUsing materialized view {MAT_SCI_VIEW}")
+            query = f"SELECT COUNT(*) as total_count FROM {MAT_SCI_VIEW};"
+
         print("\nRunning query...")
         with conn.cursor() as cur:
             cur.execute(query)
@@ -66,15 +67,13 @@ def main():
     print("="*60)
     
     # Connect
-    conn = test_connection()
-    if not conn:
+    if not test_connection():
         return
     
-    # Count
-    count = quick_count(conn)
+    # Count (the connection goes back to the pool on exit)
+    with get_connection() as conn:
+        count = quick_count(conn)
     
-    # Close
-    conn.close()
     print("✓ Test complete!")
 
 if __name__ == "__main__":
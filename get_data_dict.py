@@ -1,15 +1,5 @@
-import psycopg
 import os
-from dotenv import load_dotenv
-load_dotenv()
-
-conn = psycopg.connect(
-    dbname=os.getenv("DB_NAME"),
-    user=os.getenv("DB_USER"),
-    password=os.getenv("DB_PASSWORD"),
-    host=os.getenv("DB_HOST"),
-    port=os.getenv("DB_PORT")
-)
+from explore_mat_science.db import get_connection
 
 q_text = """
 SELECT 
@@ -68,18 +58,11 @@ LEFT JOIN (
 WHERE cols.table_schema NOT IN ('pg_catalog', 'information_schema')
 ORDER BY cols.table_schema, cols.table_name, cols.ordinal_position;"""
 
-with conn.cursor() as cur:
-    cur.execute(q_text)
-    rows = cur.fetchall()
-    # Save results to a text file instead of printing
+with get_connection() as conn, conn.cursor() as cur:
+    # Save results to a text file instead of printing; COPY streams the
+    # server-formatted CSV straight to disk without building Python rows
     out_path = os.path.join(os.path.dirname(__file__), "open_Alex_schema_tables.txt")
-    with open(out_path, "w", encoding="utf-8") as f:
-        for row in rows:
-            # If the row contains a single column (table_name) write that, else write the full row repr
-            if len(row) == 1:
-                f.write(f"{row[0]}\n")
-            else:
-                f.write(f"{row}\n")
-
-conn.close()
-
+    copy_sql = f"COPY ({q_text.rstrip(';')}) TO STDOUT (FORMAT CSV, HEADER)"
+    with open(out_path, "wb") as f, cur.copy(copy_sql) as copy:
+        for data in copy:
+            f.write(data)
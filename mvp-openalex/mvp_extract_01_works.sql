@@ -15,7 +15,13 @@
 -- Output: CSV for Neo4j import (Work nodes)
 -- ============================================================================
 
-CREATE TEMP TABLE IF NOT EXISTS mvp_works AS
+-- UNLOGGED (not TEMP) so every connection of a run shares one copy instead
+-- of rebuilding it per session, and no WAL is written for it.
+-- run_mvp_extraction.py replaces mvp_works with a table of its own run
+-- (mvp_staging.works_<run id>) and drops it once every step has finished
+DROP TABLE IF EXISTS mvp_works;
+
+CREATE UNLOGGED TABLE mvp_works AS
 SELECT DISTINCT w.id
 FROM openalex.works w
 JOIN openalex.works_topics wt ON w.id = wt.work_id
@@ -23,10 +29,14 @@ JOIN openalex.topics t ON wt.topic_id = t.id
 WHERE t.subfield_id = 'https://openalex.org/subfields/2507'  -- Polymers and Plastics ONLY
 AND w.publication_year = 2024;
 
--- Create index for faster joins
-CREATE INDEX idx_mvp_works_id ON mvp_works(id);
+-- Create index for faster joins (unnamed, so each run's table gets its own)
+CREATE INDEX ON mvp_works(id);
+
+-- Planner statistics for the joins in later steps
+ANALYZE mvp_works;
 
 -- Extract full work details
+-- @export
 SELECT 
     w.id,
     w.doi,
@@ -19,9 +19,10 @@ WHERE wa.work_id IN (SELECT id FROM mvp_works)
   AND wa.author_id IS NOT NULL;
 
 -- Create index
-CREATE INDEX idx_mvp_author_ids ON mvp_author_ids(author_id);
+CREATE INDEX IF NOT EXISTS idx_mvp_author_ids ON mvp_author_ids(author_id);
 
 -- Extract full author details
+-- @export
 SELECT 
     a.id,
     a.orcid,
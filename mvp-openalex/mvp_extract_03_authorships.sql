@@ -11,6 +11,7 @@
 -- Output: CSV for Neo4j import (AUTHORED relationships)
 -- ============================================================================
 
+-- @export
 SELECT 
     wa.work_id,
     wa.author_id,
@@ -45,14 +46,24 @@ FROM (
 ) subquery;
 
 -- Author position distribution
+-- (total taken once from the grouped rows rather than via a window over them)
+WITH position_counts AS (
+    SELECT 
+        author_position,
+        COUNT(*) as count
+    FROM openalex.works_authorships wa
+    WHERE wa.work_id IN (SELECT id FROM mvp_works)
+      AND wa.author_id IS NOT NULL
+    GROUP BY author_position
+),
+total AS (
+    SELECT SUM(count) as total_count FROM position_counts
+)
 SELECT 
     author_position,
-    COUNT(*) as count,
-    ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
-FROM openalex.works_authorships wa
-WHERE wa.work_id IN (SELECT id FROM mvp_works)
-  AND wa.author_id IS NOT NULL
-GROUP BY author_position
+    count,
+    ROUND(100.0 * count / total_count, 2) as percentage
+FROM position_counts, total
 ORDER BY 
     CASE author_position
         WHEN 'first' THEN 1
@@ -19,9 +19,10 @@ WHERE wa.work_id IN (SELECT id FROM mvp_works)
   AND wa.institution_id IS NOT NULL;
 
 -- Create index
-CREATE INDEX idx_mvp_institution_ids ON mvp_institution_ids(institution_id);
+CREATE INDEX IF NOT EXISTS idx_mvp_institution_ids ON mvp_institution_ids(institution_id);
 
 -- Extract full institution details
+-- @export
 SELECT 
     i.id,
     i.ror,
@@ -19,9 +19,10 @@ WHERE wt.work_id IN (SELECT id FROM mvp_works)
   AND wt.topic_id IS NOT NULL;
 
 -- Create index
-CREATE INDEX idx_mvp_topic_ids ON mvp_topic_ids(topic_id);
+CREATE INDEX IF NOT EXISTS idx_mvp_topic_ids ON mvp_topic_ids(topic_id);
 
 -- Extract full topic details
+-- @export
 SELECT 
     t.id,
     t.display_name,
@@ -12,6 +12,7 @@
 -- Output: CSV for Neo4j import (CITED relationships - internal network)
 -- ============================================================================
 
+-- @export
 SELECT 
     rw.work_id as citing_work_id,
     rw.referenced_work_id as cited_work_id,
@@ -45,6 +46,7 @@ HAVING COUNT(*) >= 3  -- Cited by at least 3 MVP papers
 ORDER BY citation_count DESC;
 
 -- Extract these citations
+-- @export
 SELECT 
     rw.work_id as citing_work_id,
     rw.referenced_work_id as cited_work_id,
@@ -74,6 +76,7 @@ WHERE rw.referenced_work_id IN (SELECT id FROM mvp_works)
 GROUP BY rw.work_id;
 
 -- Extract these citations
+-- @export
 SELECT 
     rw.work_id as citing_work_id,
     rw.referenced_work_id as cited_work_id,
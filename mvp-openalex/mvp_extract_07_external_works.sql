@@ -13,6 +13,7 @@
 -- Output: CSV for Neo4j import (Additional Work nodes)
 -- ============================================================================
 
+-- @export
 SELECT 
     w.id,
     w.doi,
@@ -40,6 +41,7 @@ ORDER BY w.id;
 -- Output: CSV for Neo4j import (Additional Work nodes)
 -- ============================================================================
 
+-- @export
 SELECT 
     w.id,
     w.doi,
@@ -84,15 +86,26 @@ WHERE w.id IN (SELECT work_id FROM mvp_external_citing_works);
 -- YEAR DISTRIBUTION: What years are we citing?
 -- ============================================================================
 
+-- (total taken once from the grouped rows rather than via a window over them,
+-- percentages stay relative to all years, not just the 20 shown)
+WITH year_counts AS (
+    SELECT 
+        w.publication_year,
+        COUNT(*) as work_count
+    FROM openalex.works w
+    WHERE w.id IN (SELECT referenced_work_id FROM mvp_external_cited_works)
+      AND w.publication_year IS NOT NULL
+    GROUP BY w.publication_year
+),
+total AS (
+    SELECT SUM(work_count) as total_count FROM year_counts
+)
 SELECT 
-    w.publication_year,
-    COUNT(*) as work_count,
-    ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
-FROM openalex.works w
-WHERE w.id IN (SELECT referenced_work_id FROM mvp_external_cited_works)
-  AND w.publication_year IS NOT NULL
-GROUP BY w.publication_year
-ORDER BY w.publication_year DESC
+    publication_year,
+    work_count,
+    ROUND(100.0 * work_count / total_count, 2) as percentage
+FROM year_counts, total
+ORDER BY publication_year DESC
 LIMIT 20;
 
 -- Shows recency of citations (2024 papers likely cite 2018-2023 heavily)
@@ -19,6 +19,7 @@ WHERE wpl.work_id IN (SELECT id FROM mvp_works)
   AND wpl.source_id IS NOT NULL;
 
 -- Extract full source details
+-- @export
 SELECT 
     s.id,
     s.issn_l,
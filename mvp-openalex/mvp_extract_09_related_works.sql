@@ -22,13 +22,17 @@ UNION
 SELECT work_id FROM mvp_external_citing_works;
 
 -- Extract related works where both are in extended set
+-- RELATED_TO is undirected, so (a,b) and (b,a) are the same link: order each
+-- pair canonically and keep it once, halving the relationships to import
+-- @export
 SELECT 
-    wrw.work_id,
-    wrw.related_work_id
+    LEAST(wrw.work_id, wrw.related_work_id) AS work_id,
+    GREATEST(wrw.work_id, wrw.related_work_id) AS related_work_id
 FROM openalex.works_related_works wrw
 WHERE wrw.work_id IN (SELECT id FROM mvp_extended_works)
   AND wrw.related_work_id IN (SELECT id FROM mvp_extended_works)
-ORDER BY wrw.work_id;
+GROUP BY 1, 2
+ORDER BY 1;
 
 -- Expected: Variable, depends on OpenAlex's related works algorithm
 
@@ -18,20 +18,45 @@ Extractions:
 7. External works (cited/citing)
 8. Sources & Publishers
 9. Related works
+
+Each SQL file marks the SELECT(s) that produce its CSV with a `-- @export`
+comment line; the other SELECTs are diagnostics. By default diagnostics are
+only planned (EXPLAIN) to validate them; --run-diagnostics executes them.
+
+Steps that don't depend on each other run concurrently, each lane on its
+own pooled connection.
+
+Requirements:
+- psycopg[binary]
+- psycopg-pool
+- python-dotenv
+- sqlparse
+- pyarrow (optional, for --format parquet)
+- zstandard (optional, for --zstd)
+- .env file with database credentials
 """
 
+import argparse
+import hashlib
+import json
 import psycopg
-import pandas as pd
 import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 import logging
 from datetime import datetime
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool
+import sqlparse
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s'
 )
 logger = logging.getLogger(__name__)
 
@@ -44,20 +69,311 @@ DB_PARAMS = {
     'user': os.getenv('DB_USER'),
     'password': os.getenv('DB_PASSWORD'),
     'host': os.getenv('DB_HOST'),
-    'port': os.getenv('DB_PORT')
+    'port': os.getenv('DB_PORT'),
+    # Long COPY streams hold a connection for minutes; keepalives stop idle
+    # NAT/firewall links from dropping it and surface a dead peer quickly
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 6,
+    'tcp_user_timeout': 30000
 }
 
 # Output directory
 OUTPUT_DIR = Path('mvp-openalex/mvp_output')
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Per-step state (rows, SQL hash, output file) used by --resume
+MANIFEST_FILE = OUTPUT_DIR / 'manifest.json'
+
+# SQL files live next to this script; the current directory is the fallback
+SQL_DIR = Path('mvp-openalex')
+
+# Pool sizing for the concurrent extraction lanes
+POOL_MIN_SIZE = 4
+POOL_MAX_SIZE = 8
+MAX_WORKERS = 6
+
+# Schema for each run's works table; the SQL files say mvp_works, which is
+# rewritten to that run's table (see MVPExtractor.works_table) when read
+WORKS_SCHEMA = 'mvp_staging'
+WORKS_TABLE_RE = re.compile(r'\bmvp_works\b')
+
+# Marks the SELECT(s) in a SQL file whose rows are written to the step's CSV
+EXPORT_MARKER = '-- @export'
+
+# COPY rows are coalesced into blocks of this size before being handed to
+# the writer thread; at most WRITE_QUEUE_BLOCKS blocks wait in memory
+WRITE_BLOCK_SIZE = 1 << 20
+WRITE_QUEUE_BLOCKS = 16
+
+# Leading keyword(s) of a statement, after any comment lines; one match
+# classifies it instead of repeated upper()/in scans over the whole text
+STATEMENT_RE = re.compile(
+    r'^\s*(?:--[^\n]*\n\s*)*'
+    r'(SELECT|WITH|CREATE\s+TEMP(?:ORARY)?\s+TABLE|CREATE\s+(?:UNIQUE\s+)?INDEX'
+    r'|CREATE|DROP|INSERT|UPDATE|DELETE|ANALYZE)\b',
+    re.IGNORECASE
+)
+
+# Statement kinds that return no rows and can be queued into a pipeline
+QUEUED_KINDS = {'CREATE TEMP TABLE', 'CREATE INDEX', 'CREATE', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'ANALYZE'}
+
+# Rows per Parquet row group (fetched per round trip from the named cursor)
+FETCH_SIZE = 50_000
+
+
+def scan_sql_files(*dirs):
+    """
+    Map SQL file name -> path with a single directory listing per dir.
+    
+    Earlier directories win when the same name appears in several.
+    """
+    found = {}
+    for directory in reversed(dirs):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.sql') and entry.is_file():
+                        found[entry.name] = Path(entry.path)
+        except FileNotFoundError:
+            continue
+    return found
+
+def split_statements(sql):
+    """
+    Split a SQL script into statements.
+    
+    Unlike a plain split on ';', sqlparse leaves semicolons inside string
+    literals, comments and dollar-quoted bodies alone. Leading comments
+    (including EXPORT_MARKER) stay attached to their statement.
+    """
+    statements = []
+    for stmt in sqlparse.split(sql):
+        stmt = stmt.strip()
+        if stmt.endswith(';'):
+            stmt = stmt[:-1].rstrip()
+        if stmt:
+            statements.append(stmt)
+    return statements
+
+def statement_kind(stmt):
+    """
+    Classify a statement by its leading keyword(s).
+    
+    Returns:
+        'SELECT', 'WITH', 'CREATE TEMP TABLE', 'CREATE INDEX', 'CREATE',
+        'DROP', 'INSERT', 'UPDATE', 'DELETE', 'ANALYZE', or None if unrecognised
+    """
+    match = STATEMENT_RE.match(stmt)
+    if not match:
+        return None
+    kind = ' '.join(match.group(1).upper().split())
+    if kind.startswith('CREATE TEMP'):
+        return 'CREATE TEMP TABLE'
+    if kind.startswith('CREATE') and kind.endswith('INDEX'):
+        return 'CREATE INDEX'
+    return kind
+
+def parse_statements(sql):
+    """
+    Split and classify a SQL script once, before anything is executed.
+    
+    Comment-only fragments are dropped.
+    
+    Returns:
+        List of (kind, stmt, is_export) tuples; kind is from statement_kind()
+        and is_export marks statements carrying EXPORT_MARKER
+    """
+    parsed = []
+    for stmt in split_statements(sql):
+        kind = statement_kind(stmt)
+        if kind is None and all(
+            not line.strip() or line.strip().startswith('--') for line in stmt.split('\n')
+        ):
+            continue
+        parsed.append((kind, stmt, EXPORT_MARKER in stmt))
+    return parsed
+
+def statement_preview(stmt, max_lines=3, max_chars=150):
+    """First few code lines of a statement, inline comments removed."""
+    clean_lines = []
+    for line in stmt.split('\n'):
+        line = line.split('--')[0].strip()
+        if line:
+            clean_lines.append(line)
+            if len(clean_lines) == max_lines:
+                break
+    return ' '.join(clean_lines)[:max_chars]
+
+class ParquetSink:
+    """
+    Writes one or more export queries into a single Parquet file.
+    
+    The schema is taken from the first query's column types; later queries
+    in the same file must return the same columns.
+    """
+    
+    def __init__(self, output_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.pq = pq
+        self.output_path = output_path
+        self.writer = None
+        self.schema = None
+        
+        # Arrow types for PostgreSQL result types; anything else is written as text
+        self.arrow_types = {
+            'int2': pa.int64(), 'int4': pa.int64(), 'int8': pa.int64(),
+            'float4': pa.float64(), 'float8': pa.float64(),
+            'bool': pa.bool_(),
+            'date': pa.date32(),
+            'timestamp': pa.timestamp('us'),
+            'timestamptz': pa.timestamp('us', tz='UTC'),
+        }
+    
+    def _schema(self, conn, description):
+        """Build the Arrow schema from the cursor description."""
+        fields = []
+        for col in description:
+            info = conn.adapters.types.get(col.type_code)
+            arrow_type = self.arrow_types.get(info.name if info else None, self.pa.string())
+            fields.append(self.pa.field(col.name, arrow_type))
+        return self.pa.schema(fields)
+    
+    @staticmethod
+    def _as_text(value):
+        """Render a non-text value (numeric, json, array, ...) for a string column."""
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return str(value)
+    
+    def write_query(self, conn, stmt, cursor_name):
+        """
+        Stream a SELECT into the file, one row group per FETCH_SIZE rows.
+        
+        Returns:
+            Number of rows written
+        """
+        rows_written = 0
+        # Binary results: ints, floats and timestamps arrive as native values
+        # instead of being parsed from text
+        with conn.cursor(name=cursor_name, binary=True) as cur:
+            cur.itersize = FETCH_SIZE
+            cur.execute(stmt)
+            while True:
+                rows = cur.fetchmany(FETCH_SIZE)
+                if self.schema is None:
+                    self.schema = self._schema(conn, cur.description)
+                    self.writer = self.pq.ParquetWriter(self.output_path, self.schema, compression='zstd')
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                arrays = []
+                for field, values in zip(self.schema, columns):
+                    if field.type == self.pa.string():
+                        values = [self._as_text(v) for v in values]
+                    arrays.append(self.pa.array(values, type=field.type))
+                self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+                rows_written += len(rows)
+        conn.commit()
+        return rows_written
+    
+    def close(self):
+        """Finish the Parquet file."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
 class MVPExtractor:
     """Main ETL orchestrator for MVP extraction."""
     
-    def __init__(self):
-        self.conn = None
+    def __init__(self, output_format='csv', run_diagnostics=False, compress=False, resume=False):
+        self.output_format = output_format
+        self.compress = compress
+        self.resume = resume
+        self.run_diagnostics = run_diagnostics
+        self.pool = None
+        # mvp_staging.works_<run id>, set before step 01 runs
+        self.works_table = None
         self.stats = {}
+        self.outputs = {}
+        self.stats_lock = threading.Lock()
+        self.sql_files = scan_sql_files(SQL_DIR, Path('.'))
+        self.manifest = self.load_manifest()
+    
+    @staticmethod
+    def load_manifest():
+        """Read the per-step manifest left by earlier runs, if any."""
+        try:
+            with open(MANIFEST_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    @staticmethod
+    def sql_hash(sql_file):
+        """SHA-256 of a SQL file's contents."""
+        return hashlib.sha256(sql_file.read_bytes()).hexdigest()
+    
+    def output_path_for(self, output_csv):
+        """Where a step's rows go for the chosen format and compression."""
+        output_path = OUTPUT_DIR / output_csv
+        if self.output_format == 'parquet':
+            return output_path.with_suffix('.parquet')
+        if self.compress:
+            return output_path.with_name(output_path.name + '.zst')
+        return output_path
+    
+    def completed_step(self, step_name, sql_file, output_csv):
+        """
+        Manifest entry for a step that --resume can skip, else None.
         
+        A step counts as done when its SQL file is unchanged and the output
+        file it wrote is still there, untouched since.
+        """
+        if not self.resume:
+            return None
+        entry = self.manifest.get(step_name)
+        resolved = self.sql_files.get(sql_file.name)
+        if not entry or resolved is None or entry['sha256'] != self.sql_hash(resolved):
+            return None
+        output_path = self.output_path_for(output_csv)
+        if entry['output'] != output_path.name or not output_path.exists():
+            return None
+        if output_path.stat().st_mtime != entry['mtime']:
+            return None
+        return entry
+    
+    def skip_step(self, step_name, entry):
+        """Count a completed step from the manifest instead of running it."""
+        logger.info(f"○ {step_name}: unchanged since last run, skipping ({entry['rows']:,} rows in {entry['output']})")
+        with self.stats_lock:
+            self.stats[step_name] = entry['rows']
+            self.outputs[step_name] = OUTPUT_DIR / entry['output']
+    
+    def record_step(self, step_name, sql_file, rows, output_path, **extra):
+        """Save a finished step to the manifest (written after every step)."""
+        with self.stats_lock:
+            if rows and output_path:
+                self.manifest[step_name] = {
+                    'rows': rows,
+                    'sha256': self.sql_hash(sql_file),
+                    'output': output_path.name,
+                    'mtime': output_path.stat().st_mtime,
+                    **extra,
+                }
+            else:
+                self.manifest.pop(step_name, None)
+            # Replace atomically so a crash never leaves a half-written manifest
+            tmp_file = MANIFEST_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(tmp_file, MANIFEST_FILE)
+    
     def connect(self):
         """Establish database connection."""
         try:
@@ -71,12 +387,12 @@ class MVPExtractor:
             logger.info("Password: [HIDDEN]")
             
             logger.info("\nAttempting connection...")
-            self.conn = psycopg.connect(**DB_PARAMS)
+            conn = psycopg.connect(**DB_PARAMS)
             logger.info("✓ Database connected successfully!")
             
             # Test connection
             logger.info("\nTesting connection with simple query...")
-            with self.conn.cursor() as cur:
+            with conn, conn.cursor() as cur:
                 cur.execute("SELECT version()")
                 version = cur.fetchone()[0]
                 logger.info(f"✓ PostgreSQL version: {version[:80]}")
@@ -93,6 +409,19 @@ class MVPExtractor:
                     logger.error(f"✗ Cannot create TEMP tables: {perm_error}")
                     logger.error("  → You may need to run with a user that has CREATE TEMP TABLE permission")
                 
+                # Step 01 builds its works table in WORKS_SCHEMA, creating the
+                # schema first if it isn't there yet
+                cur.execute(
+                    "SELECT COALESCE("
+                    "(SELECT has_schema_privilege(oid, 'CREATE') FROM pg_namespace WHERE nspname = %s), "
+                    "has_database_privilege(current_database(), 'CREATE'))",
+                    (WORKS_SCHEMA,)
+                )
+                if cur.fetchone()[0]:
+                    logger.info(f"✓ Can create tables in the {WORKS_SCHEMA} schema")
+                else:
+                    logger.error(f"✗ Cannot create tables in the {WORKS_SCHEMA} schema (needed for the works table)")
+                
                 # Check if we can access openalex schema
                 try:
                     cur.execute("SELECT COUNT(*) FROM openalex.works LIMIT 1")
@@ -108,7 +437,18 @@ class MVPExtractor:
                 logger.info(f"✓ Current user: {db_info[1]}")
                 logger.info(f"✓ Current schema: {db_info[2]}")
             
-            self.conn.commit()
+            
+            # Open the pool
+            logger.info(f"\nOpening connection pool ({POOL_MIN_SIZE}-{POOL_MAX_SIZE} connections)...")
+            self.pool = ConnectionPool(
+                conninfo=make_conninfo(**DB_PARAMS),
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                open=False
+            )
+            self.pool.open(wait=True, timeout=600)
+            logger.info("✓ Connection pool ready")
+            
             logger.info("\n" + "="*80)
             logger.info("✓ CONNECTION SUCCESSFUL - READY TO EXTRACT")
             logger.info("="*80 + "\n")
@@ -142,162 +482,259 @@ class MVPExtractor:
             logger.error("\n" + "="*80 + "\n")
             return False
     
-    def execute_sql_file(self, sql_file, output_csv=None):
+    def export_query(self, cur, stmt, output_path, append=False):
         """
-        Execute SQL from file and optionally save to CSV.
+        Stream an export SELECT to CSV with COPY ... TO STDOUT.
+        
+        The server formats the CSV, so rows are copied to disk as bytes
+        without building Python objects. A writer thread drains the data
+        to disk so the next fetch from the server overlaps the file write.
+        With compress set the writer thread also zstd-compresses the data;
+        appended exports become extra zstd frames in the same file.
         
         Args:
+            cur: Cursor to run on (shared by the statements of one file)
+            stmt: SELECT statement
+            output_path: CSV file to write
+            append: Append to an existing CSV (no header) instead of overwriting
+            
+        Returns:
+            Number of rows written
+        """
+        # Newlines keep a trailing "--" comment from swallowing the ")"
+        header = "" if append else ", HEADER"
+        copy_sql = f"COPY (\n{stmt}\n) TO STDOUT WITH (FORMAT CSV{header})"
+        blocks = queue.Queue(maxsize=WRITE_QUEUE_BLOCKS)
+        write_errors = []
+        
+        with open(output_path, 'ab' if append else 'wb') as f:
+            if self.compress:
+                import zstandard
+                f = zstandard.ZstdCompressor(level=3).stream_writer(f)
+            writer = threading.Thread(
+                target=self._write_blocks, args=(f, blocks, write_errors), daemon=True
+            )
+            writer.start()
+            try:
+                buffer = bytearray()
+                with cur.copy(copy_sql) as copy:
+                    for data in copy:
+                        buffer += data
+                        if len(buffer) >= WRITE_BLOCK_SIZE:
+                            blocks.put(bytes(buffer))
+                            buffer.clear()
+                if buffer:
+                    blocks.put(bytes(buffer))
+            finally:
+                blocks.put(None)
+                writer.join()
+                if self.compress:
+                    f.close()  # Flushes the final zstd frame
+        rows_written = cur.rowcount
+        cur.connection.commit()
+        
+        if write_errors:
+            raise write_errors[0]
+        return rows_written
+    
+    @staticmethod
+    def _write_blocks(f, blocks, write_errors):
+        """Write queued blocks to f until the None sentinel arrives."""
+        while True:
+            block = blocks.get()
+            if block is None:
+                return
+            # After a failed write keep draining so the reader never blocks
+            if write_errors:
+                continue
+            try:
+                f.write(block)
+            except Exception as e:
+                write_errors.append(e)
+    
+    def flush_statements(self, cur, pending):
+        """
+        Send queued non-query statements in one pipeline and clear the queue.
+        
+        If the batch fails it is rolled back and replayed one statement at a
+        time, so a failing statement is skipped on its own as before.
+        
+        Returns:
+            Number of statements that succeeded
+        """
+        if not pending:
+            return 0
+        
+        conn = cur.connection
+        batch = list(pending)
+        pending.clear()
+        
+        try:
+            with conn.pipeline():
+                for stmt in batch:
+                    cur.execute(stmt)
+            conn.commit()
+            logger.info("      ✓ Success (%d statement(s) in one round trip)", len(batch))
+            return len(batch)
+        except Exception as batch_error:
+            conn.rollback()
+            logger.warning("      ⚠ Pipelined batch failed (%s), retrying one at a time...", batch_error)
+        
+        succeeded = 0
+        for stmt in batch:
+            try:
+                cur.execute(stmt)
+                conn.commit()
+                succeeded += 1
+            except Exception as stmt_error:
+                conn.rollback()
+                logger.error("      ✗ Statement failed: %s", stmt_error)
+                logger.error("      Statement preview: %s", stmt[:200])
+                logger.warning("      ⚠ Non-critical statement failed, continuing...")
+        return succeeded
+    
+    def execute_sql_file(self, conn, sql_file, output_csv=None):
+        """
+        Execute SQL from file and stream its export SELECT(s) to CSV.
+        
+        Statements marked with EXPORT_MARKER are written to output_csv;
+        several marked statements in one file are appended to the same CSV
+        and must share the same columns. With output_format 'parquet' the
+        same rows go to a .parquet file of the same name instead.
+        
+        Args:
+            conn: Connection to run on (its temp tables carry between files)
             sql_file: Path to SQL file
             output_csv: Optional output CSV filename
+            
+        Returns:
+            (row_count, output_path) for the exported rows, or (None, None)
+            on failure; output_path is None when nothing was exported
         """
+        parquet_sink = None
+        cur = None
         try:
             logger.info(f"\n{'='*80}")
             logger.info(f"Executing: {sql_file.name}")
             logger.info(f"{'='*80}")
             
-            # Check if file exists
-            if not sql_file.exists():
-                logger.error(f"✗ File not found: {sql_file}")
-                return None
-            
             logger.info(f"✓ Reading SQL file: {sql_file}")
             with open(sql_file, 'r') as f:
                 sql = f.read()
+            # Point every reference to mvp_works at this run's table
+            sql = WORKS_TABLE_RE.sub(self.works_table, sql)
             
             logger.info(f"✓ File size: {len(sql)} characters")
             
-            # Split into statements (simple split on ';')
-            statements = [s.strip() for s in sql.split(';') if s.strip()]
+            statements = parse_statements(sql)
             logger.info(f"✓ Found {len(statements)} SQL statements")
             
-            df = None
+            output_path = self.output_path_for(output_csv) if output_csv else None
+            if output_path and self.output_format == 'parquet':
+                parquet_sink = ParquetSink(output_path)
+            # One cursor serves every statement in the file
+            cur = conn.cursor()
+            pending = []
+            rows_exported = 0
+            export_count = 0
             stmt_count = 0
             
-            for i, stmt in enumerate(statements, 1):
-                # Clean up statement first
-                stmt = stmt.strip()
-                
-                # Skip empty statements
-                if not stmt:
-                    logger.debug(f"  Skipping statement {i} (empty)")
-                    continue
-                
-                # Skip pure comment blocks (lines that are ONLY comments)
-                # But allow statements that contain inline comments
-                lines = [l.strip() for l in stmt.split('\n') if l.strip()]
-                non_comment_lines = [l for l in lines if not l.startswith('--')]
-                
-                if not non_comment_lines:
-                    logger.debug(f"  Skipping statement {i} (comment only)")
-                    continue
+            # Statements were classified when the file was parsed
+            for i, (kind, stmt, is_export) in enumerate(statements, 1):
+                # Log what we're about to execute; the preview is only built
+                # when it will actually be written
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("\n  [%d/%d] Executing: %s...", i, len(statements), statement_preview(stmt))
                 
-                # Log what we're about to execute
-                # Remove inline comments for cleaner preview
-                clean_lines = []
-                for line in stmt.split('\n'):
-                    # Keep the line but remove inline comments
-                    if '--' in line:
-                        # Find the comment part
-                        line = line.split('--')[0].strip()
-                    if line:
-                        clean_lines.append(line)
-                
-                stmt_preview = ' '.join(clean_lines[:3])[:150]  # First few lines, max 150 chars
-                logger.info(f"\n  [{i}/{len(statements)}] Executing: {stmt_preview}...")
+                is_query = kind in ('SELECT', 'WITH')
                 
                 try:
-                    # Check statement type on the cleaned statement
-                    # Get first non-comment line for type detection
-                    first_code_line = ''
-                    for line in stmt.split('\n'):
-                        line_clean = line.strip()
-                        if line_clean and not line_clean.startswith('--'):
-                            first_code_line = line_clean
-                            break
-                    
-                    stmt_upper = first_code_line.upper()
+                    # Statements that return nothing are queued and sent together
+                    if kind in QUEUED_KINDS:
+                        logger.debug("      → Statement type: %s (queued)", kind)
+                        pending.append(stmt)
+                        continue
                     
-                    logger.debug(f"      First code line: '{first_code_line[:80]}'")
+                    # Anything that returns rows runs on its own, after the queue
+                    stmt_count += self.flush_statements(cur, pending)
                     
-                    if stmt_upper.startswith('SELECT'):
-                        logger.info(f"      → Query type: SELECT")
-                        df = pd.read_sql_query(stmt, self.conn)
-                        logger.info(f"      ✓ Returned {len(df):,} rows, {len(df.columns)} columns")
+                    if is_query and output_path and is_export:
+                        logger.debug("      → Query type: SELECT (export)")
+                        if parquet_sink:
+                            rows = parquet_sink.write_query(conn, stmt, f"extract_{i}")
+                        else:
+                            rows = self.export_query(cur, stmt, output_path, append=export_count > 0)
+                        rows_exported += rows
+                        export_count += 1
+                        logger.info("      ✓ Streamed %s rows → %s", f"{rows:,}", output_path.name)
                         stmt_count += 1
                         
-                    elif 'CREATE TEMP TABLE' in stmt.upper() or 'CREATE INDEX' in stmt.upper():
-                        table_or_index = 'TEMP TABLE' if 'TEMP TABLE' in stmt.upper() else 'INDEX'
-                        logger.info(f"      → Statement type: CREATE {table_or_index}")
-                        with self.conn.cursor() as cur:
-                            cur.execute(stmt)
-                        self.conn.commit()
-                        logger.info(f"      ✓ Success")
+                    elif is_query and not self.run_diagnostics:
+                        # Plan only: validates the query without scanning anything
+                        logger.debug("      → Query type: SELECT (diagnostic, EXPLAIN only)")
+                        cur.execute(f"EXPLAIN\n{stmt}")
+                        conn.commit()
+                        logger.info("      ✓ Plan OK")
                         stmt_count += 1
                         
-                    elif stmt_upper.startswith(('CREATE', 'DROP', 'INSERT', 'UPDATE', 'DELETE')):
-                        logger.info(f"      → Statement type: {stmt_upper.split()[0]}")
-                        with self.conn.cursor() as cur:
-                            cur.execute(stmt)
-                        self.conn.commit()
-                        logger.info(f"      ✓ Success")
+                    elif is_query:
+                        logger.debug("      → Query type: SELECT")
+                        cur.execute(stmt)
+                        rows = cur.fetchall()
+                        logger.info("      ✓ Returned %d rows, %d columns", len(rows), len(cur.description))
+                        conn.commit()
                         stmt_count += 1
                         
                     else:
-                        logger.warning(f"      ⚠ Statement didn't match known patterns, trying SELECT first...")
-                        logger.debug(f"      Statement starts with: '{stmt_upper[:100]}'")
-                        # Try as SELECT first (most common for data extraction)
-                        try:
-                            df = pd.read_sql_query(stmt, self.conn)
-                            logger.info(f"      ✓ Success (SELECT) - Returned {len(df):,} rows")
-                            stmt_count += 1
-                        except Exception as select_err:
-                            # If SELECT fails, try as DDL/DML
-                            logger.debug(f"      SELECT failed: {select_err}, trying as DDL/DML...")
-                            with self.conn.cursor() as cur:
-                                cur.execute(stmt)
-                            self.conn.commit()
-                            logger.info(f"      ✓ Success (DDL/DML)")
-                            stmt_count += 1
+                        logger.warning("      ⚠ Statement didn't match known patterns, running it directly...")
+                        # A result description tells a query apart from DDL/DML
+                        cur.execute(stmt)
+                        if cur.description is not None:
+                            rows = cur.fetchall()
+                            logger.info("      ✓ Success (SELECT) - Returned %d rows", len(rows))
+                        else:
+                            logger.info("      ✓ Success (DDL/DML)")
+                        conn.commit()
+                        stmt_count += 1
                         
                 except Exception as stmt_error:
-                    logger.error(f"      ✗ Statement failed: {stmt_error}")
-                    logger.error(f"      Statement preview: {stmt[:200]}")
+                    logger.error("      ✗ Statement failed: %s", stmt_error)
+                    logger.error("      Statement preview: %s", stmt[:200])
                     
                     # Check if it's a permissions error
                     error_str = str(stmt_error).lower()
                     if 'permission' in error_str or 'denied' in error_str:
                         logger.error("      ⚠ PERMISSIONS ERROR: Database user may not have required permissions")
-                        logger.error("      Required permissions: CREATE TEMP TABLE, CREATE INDEX, SELECT, INSERT")
+                        logger.error("      Required permissions: CREATE (schema), CREATE TEMP TABLE, CREATE INDEX, SELECT, INSERT")
                     elif 'does not exist' in error_str:
                         logger.error("      ⚠ TABLE/COLUMN NOT FOUND: Check if tables exist in database")
                     
                     # Decide whether to continue or abort
-                    if stmt_upper.startswith('SELECT'):
+                    if is_query:
                         logger.error("      ✗ Critical SELECT failed, aborting file")
                         raise
                     else:
                         logger.warning("      ⚠ Non-critical statement failed, continuing...")
+                        # Clear the aborted transaction so later statements can run
+                        conn.rollback()
                         continue
             
+            stmt_count += self.flush_statements(cur, pending)
+            
             logger.info(f"\n{'='*80}")
             logger.info(f"✓ Executed {stmt_count} statements successfully")
             
-            # Save the main extraction result if CSV requested
-            # The extraction query should be the largest SELECT result
-            if output_csv:
-                if df is not None and len(df) > 0:
-                    output_path = OUTPUT_DIR / output_csv
-                    df.to_csv(output_path, index=False)
-                    logger.info(f"✓ Saved: {output_csv} ({len(df):,} rows, {len(df.columns)} columns)")
+            if output_path:
+                if rows_exported > 0:
+                    logger.info(f"✓ Saved: {output_path.name} ({rows_exported:,} rows from {export_count} export queries)")
                     logger.info(f"✓ File path: {output_path}")
-                    return df
+                elif export_count == 0:
+                    logger.warning(f"⚠ No {EXPORT_MARKER} query found in {sql_file.name}; nothing saved to {output_path.name}")
                 else:
-                    logger.warning(f"⚠ No data to save for {output_csv}")
-                    logger.warning(f"   Last df had {len(df) if df is not None else 0} rows")
-                    return None
+                    logger.warning(f"⚠ No data to save for {output_path.name}")
             
             logger.info(f"✓ Completed: {sql_file.name}")
-            return df
+            return rows_exported, (output_path if export_count else None)
             
         except Exception as e:
             logger.error(f"\n{'='*80}")
@@ -312,9 +749,10 @@ class MVPExtractor:
             
             # Try to get more info about connection state
             try:
-                if self.conn:
+                if conn:
                     logger.info("Checking connection state...")
-                    with self.conn.cursor() as cur:
+                    conn.rollback()
+                    with conn.cursor() as cur:
                         cur.execute("SELECT 1")
                     logger.info("✓ Connection still alive")
                 else:
@@ -322,36 +760,64 @@ class MVPExtractor:
             except Exception as conn_error:
                 logger.error(f"✗ Connection check failed: {conn_error}")
             
-            return None
+            return None, None
+        
+        finally:
+            if parquet_sink:
+                parquet_sink.close()
+            if cur:
+                cur.close()
     
-    def run_extraction(self, step_name, sql_file, output_csv):
-        """Run a single extraction step."""
+    def run_extraction(self, conn, step_name, sql_file, output_csv, **extra):
+        """
+        Run a single extraction step on the given connection.
+        
+        extra is stored with the step's manifest entry.
+        """
         logger.info(f"\n{'='*80}")
         logger.info(f"STEP: {step_name}")
         logger.info(f"{'='*80}")
         
-        # Check if SQL file exists
-        if not sql_file.exists():
-            # Try looking in current directory
-            sql_file_alt = Path('.') / sql_file.name
-            if sql_file_alt.exists():
-                sql_file = sql_file_alt
-                logger.info(f"✓ Found SQL file in current directory: {sql_file}")
-            else:
-                logger.error(f"✗ SQL file not found: {sql_file}")
-                logger.error(f"  Also tried: {sql_file_alt}")
-                logger.error(f"  Current directory: {Path.cwd()}")
-                logger.error(f"  Please ensure SQL files are in the same directory as the script")
-                return None
+        # Look the file up in the directory scan taken at startup
+        resolved = self.sql_files.get(sql_file.name)
+        if resolved is None:
+            logger.error(f"✗ SQL file not found: {sql_file.name}")
+            logger.error(f"  Looked in: {SQL_DIR} and {Path.cwd()}")
+            logger.error(f"  Please ensure SQL files are in the same directory as the script")
+            return None
+        sql_file = resolved
         
-        df = self.execute_sql_file(sql_file, output_csv)
+        rows, output_path = self.execute_sql_file(conn, sql_file, output_csv)
+        self.record_step(step_name, sql_file, rows, output_path, **extra)
         
-        if df is not None:
-            self.stats[step_name] = len(df)
+        if rows:
+            with self.stats_lock:
+                self.stats[step_name] = rows
+                self.outputs[step_name] = output_path
         else:
             logger.warning(f"⚠ No data returned for {step_name}")
         
-        return df
+        return rows
+    
+    def run_lane(self, lane):
+        """Run a chain of dependent steps, in order, on one pooled connection."""
+        # Later steps in a lane read temp tables made by earlier ones, so a
+        # lane is only skipped as a whole
+        entries = [self.completed_step(*step) for step in lane]
+        if all(entries):
+            for (step_name, _, _), entry in zip(lane, entries):
+                self.skip_step(step_name, entry)
+            return
+        
+        with self.pool.connection() as conn:
+            for step_name, sql_file, output_csv in lane:
+                self.run_extraction(conn, step_name, sql_file, output_csv)
+    
+    def drop_works_table(self):
+        """Drop this run's works table."""
+        with self.pool.connection() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {self.works_table}")
+        logger.info(f"✓ Dropped {self.works_table}")
     
     def run_full_pipeline(self):
         """Execute complete MVP extraction pipeline."""
@@ -406,17 +872,12 @@ class MVPExtractor:
         logger.info("-"*80)
         missing_files = []
         for step_name, sql_file, _ in steps:
-            # Check in current directory
-            if sql_file.exists():
-                logger.info(f"✓ {sql_file.name}")
+            resolved = self.sql_files.get(sql_file.name)
+            if resolved is not None:
+                logger.info(f"✓ {sql_file.name} ({resolved.parent})")
             else:
-                # Try current directory
-                alt_path = Path('.') / sql_file.name
-                if alt_path.exists():
-                    logger.info(f"✓ {sql_file.name} (found in current directory)")
-                else:
-                    logger.error(f"✗ {sql_file.name} NOT FOUND")
-                    missing_files.append(sql_file.name)
+                logger.error(f"✗ {sql_file.name} NOT FOUND")
+                missing_files.append(sql_file.name)
         
         if missing_files:
             logger.error("\n" + "="*80)
@@ -435,16 +896,78 @@ class MVPExtractor:
         
         start_time = datetime.now()
         
-        # Execute each step
-        for step_name, sql_file, output_csv in steps:
-            result = self.run_extraction(step_name, sql_file, output_csv)
+        # Works first: if the core filter returns nothing, nothing else can
+        works_step = steps[0]
+        with self.pool.connection() as conn:
+            # Table of the run that last built works, if it didn't finish
+            previous_table = self.manifest.get(works_step[0], {}).get('works_table')
+            works_entry = self.completed_step(*works_step)
+            if works_entry:
+                # --resume reuses that table; UNLOGGED tables are emptied by
+                # crash recovery, so make sure it's still there and filled
+                with conn.cursor() as cur:
+                    cur.execute("SELECT to_regclass(%s::text)", (previous_table,))
+                    if cur.fetchone()[0] is None:
+                        works_entry = None
+                    else:
+                        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {previous_table})")
+                        if not cur.fetchone()[0]:
+                            works_entry = None
+                conn.rollback()
             
-            # Check if extraction failed critically
-            if result is None and step_name == "01_Works":
-                logger.error("\n✗ CRITICAL: First extraction (Works) failed!")
-                logger.error("  This is required for all other extractions.")
-                logger.error("  Aborting pipeline.")
-                return
+            if works_entry:
+                self.works_table = previous_table
+                self.skip_step(works_step[0], works_entry)
+                result = works_entry['rows']
+            else:
+                if self.resume:
+                    logger.info("○ Works must be rebuilt; later steps will re-run too")
+                # Everything else joins the works table, so nothing downstream is current
+                self.resume = False
+                # A table of its own, so concurrent runs against one database
+                # never drop or rebuild each other's
+                self.works_table = f"{WORKS_SCHEMA}.works_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+                with conn.cursor() as cur:
+                    cur.execute(f"CREATE SCHEMA IF NOT EXISTS {WORKS_SCHEMA}")
+                    if previous_table:
+                        cur.execute(f"DROP TABLE IF EXISTS {previous_table}")
+                conn.commit()
+                logger.info(f"✓ Works table for this run: {self.works_table}")
+                result = self.run_extraction(conn, *works_step, works_table=self.works_table)
+        
+        # Check if extraction failed critically
+        if not result:
+            self.drop_works_table()
+            logger.error("\n✗ CRITICAL: First extraction (Works) failed!")
+            logger.error("  This is required for all other extractions.")
+            logger.error("  Aborting pipeline.")
+            return
+        
+        # The remaining steps only need the shared works table, except 07
+        # and 09 which read the external-works temp tables created by 06
+        # (same session needed)
+        by_name = {step[0]: step for step in steps}
+        lanes = [
+            [by_name["02_Authors"]],
+            [by_name["03_Authorships"]],
+            [by_name["04_Institutions"]],
+            [by_name["05_Topics"]],
+            [by_name["06_Citations"], by_name["07_External_Works"], by_name["09_Related_Works"]],
+            [by_name["08_Sources"]],
+        ]
+        
+        logger.info(f"\nRunning {len(lanes)} extraction lanes concurrently...")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='lane') as executor:
+            futures = [executor.submit(self.run_lane, lane) for lane in lanes]
+            for future in futures:
+                future.result()
+        
+        # --resume can only skip finished steps while their works table
+        # exists, so it is kept until every step has finished
+        if all(self.manifest.get(step_name) for step_name, _, _ in steps):
+            self.drop_works_table()
+        else:
+            logger.info(f"○ Keeping {self.works_table} so --resume can finish the remaining steps")
         
         # Generate summary
         end_time = datetime.now()
@@ -474,8 +997,8 @@ class MVPExtractor:
             f.write("EXTRACTION STATISTICS:\n")
             f.write("-"*80 + "\n")
             
-            for step, count in self.stats.items():
-                f.write(f"{step:30s} {count:>15,} rows\n")
+            for step, count in sorted(self.stats.items()):
+                f.write(f"{step:30s} {count:>15,} rows  {self.outputs[step].name}\n")
             
             f.write("\n" + "="*80 + "\n")
             f.write(f"Output directory: {OUTPUT_DIR}\n")
@@ -484,14 +1007,14 @@ class MVPExtractor:
         logger.info(f"✓ Summary saved: {report_file}")
     
     def close(self):
-        """Close database connection."""
+        """Close the connection pool."""
         try:
-            if self.conn:
+            if self.pool:
                 logger.info("\n" + "="*80)
-                logger.info("CLOSING DATABASE CONNECTION")
+                logger.info("CLOSING DATABASE CONNECTIONS")
                 logger.info("="*80)
-                self.conn.close()
-                logger.info("✓ Database connection closed successfully")
+                self.pool.close()
+                logger.info("✓ Connection pool closed successfully")
             else:
                 logger.warning("⚠ No connection to close")
         except Exception as e:
@@ -500,6 +1023,17 @@ class MVPExtractor:
 def main():
     """Main execution."""
     
+    parser = argparse.ArgumentParser(description="Run the MVP OpenAlex extraction pipeline.")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help="output format for the extraction files (parquet needs pyarrow)")
+    parser.add_argument('--run-diagnostics', action='store_true',
+                        help="execute the unmarked statistics/sample SELECTs instead of only planning them")
+    parser.add_argument('--zstd', action='store_true',
+                        help="compress CSV output on the fly as .csv.zst (needs zstandard)")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip steps whose SQL and output file are unchanged since the last run")
+    args = parser.parse_args()
+    
     print("\n" + "="*80)
     print("MVP ETL EXTRACTION - STARTING")
     print("="*80)
@@ -530,7 +1064,10 @@ def main():
     
     logger.info("✓ All required environment variables set")
     
-    extractor = MVPExtractor()
+    if args.zstd and args.format == 'parquet':
+        logger.warning("⚠ --zstd only applies to CSV; Parquet files are already zstd-compressed")
+    extractor = MVPExtractor(output_format=args.format, run_diagnostics=args.run_diagnostics,
+                             compress=args.zstd, resume=args.resume)
     
     if not extractor.connect():
         logger.error("\n✗ Failed to connect to database. Exiting.")
@@ -221,7 +221,7 @@ class MVPExtractor:
                     
                     logger.debug(f"      First code line: '{first_code_line[:80]}'")
                     
-                    if stmt_upper.startswith('SELECT'):
+                    if stmt_upper.startswith(('SELECT', 'WITH')):
                         logger.info(f"      → Query type: SELECT")
                         df = pd.read_sql_query(stmt, self.conn)
                         logger.info(f"      ✓ Returned {len(df):,} rows, {len(df.columns)} columns")
@@ -288,7 +288,7 @@ class MVPExtractor:
                         logger.error("      ⚠ TABLE/COLUMN NOT FOUND: Check if tables exist in database")
                     
                     # Decide whether to continue or abort
-                    if stmt_upper.startswith('SELECT'):
+                    if stmt_upper.startswith(('SELECT', 'WITH')):
                         logger.error("      ✗ Critical SELECT failed, aborting file")
                         raise
                     else:
@@ -1,31 +1,107 @@
 #!/usr/bin/env python3
 """
 00_setup_schema.py
-Creates Neo4j constraints and indexes for optimal performance
+Creates Neo4j constraints and indexes for optimal performance, and
+(re)builds the staging.relevant_* filter tables in PostgreSQL
 Run this FIRST before loading any data
 """
 from base_loader import BaseLoader
+from neo4j.exceptions import Neo4jError
 import time
 
+# Raised when a rule with the same schema but a different name already exists
+# (IF NOT EXISTS only matches on name)
+ALREADY_EXISTS_CODES = {
+    "Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists",
+    "Neo.ClientError.Schema.ConstraintAlreadyExists",
+    "Neo.ClientError.Schema.IndexAlreadyExists",
+}
+
+# Same schema as label -> properties maps, for apoc.schema.assert
+APOC_CONSTRAINTS = {
+    "Work": ["id"],
+    "Author": ["id"],
+    "Institution": ["id"],
+    "Topic": ["id"],
+    "Source": ["id"],
+}
+APOC_INDEXES = {
+    "Work": ["publication_year", "type", "cited_by_count", "doi"],
+    "Author": ["display_name", "orcid", "works_count"],
+    "Institution": ["country_code", "type", "display_name", "ror", "paper_count"],
+    "Topic": ["display_name", "subfield_id", "field_id"],
+    "Source": ["display_name", "publisher", "is_oa"],
+}
+
 
 class SchemaSetup(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 0: Schema Setup - Constraints & Indexes")
+    def __init__(self, **connections):
+        super().__init__("Step 0: Schema Setup - Constraints & Indexes", **connections)
+    
+    @staticmethod
+    def _create_schema(tx, statements):
+        """Run every schema statement inside one write transaction"""
+        for statement in statements:
+            tx.run(statement).consume()
+    
+    @staticmethod
+    def _has_apoc_schema_assert(session):
+        """Check whether the APOC schema procedure is installed"""
+        result = session.run(
+            "SHOW PROCEDURES YIELD name WHERE name = 'apoc.schema.assert' RETURN count(*) AS n"
+        )
+        return result.single()["n"] > 0
+    
+    def _assert_schema_apoc(self, session):
+        """Create whatever is missing in one server-side call"""
+        # dropExisting=false: leave rules that aren't in the maps alone
+        result = session.run(
+            "CALL apoc.schema.assert($indexes, $constraints, false) "
+            "YIELD action RETURN action, count(*) AS n",
+            indexes=APOC_INDEXES, constraints=APOC_CONSTRAINTS
+        )
+        for record in result:
+            print(f"  ✓ {record['action']}: {record['n']}")
+    
+    def _apply_schema(self, session, label, statements):
+        """Apply a group of schema statements in one write transaction"""
+        try:
+            # All statements in one transaction: one commit, one round trip
+            session.execute_write(self._create_schema, statements)
+            print(f"  ✓ Applied {len(statements)} {label} in one transaction")
+        except Neo4jError as e:
+            if e.code not in ALREADY_EXISTS_CODES:
+                print(f"  ✗ Error: {str(e)}")
+                raise
+            # The transaction rolled back; apply one at a time to skip the duplicates
+            print(f"  ○ Some {label} already exist under other names, applying individually...")
+            for i, statement in enumerate(statements, 1):
+                try:
+                    session.run(statement).consume()
+                    print(f"  ✓ [{i}/{len(statements)}] {statement[:60]}...")
+                except Neo4jError as e:
+                    if e.code in ALREADY_EXISTS_CODES:
+                        print(f"  ○ [{i}/{len(statements)}] Already exists: {statement[:60]}...")
+                    else:
+                        print(f"  ✗ [{i}/{len(statements)}] Error: {str(e)}")
+                        raise
     
     def setup_schema(self):
         """Create all constraints and indexes"""
         print("\nCreating constraints and indexes...")
         print("This may take a minute...")
         
-        # List of all schema statements (must be executed one at a time)
-        statements = [
-            # Constraints
+        # Uniqueness constraints (each populates its own backing index)
+        constraint_stmts = [
             "CREATE CONSTRAINT work_id IF NOT EXISTS FOR (w:Work) REQUIRE w.id IS UNIQUE",
             "CREATE CONSTRAINT author_id IF NOT EXISTS FOR (a:Author) REQUIRE a.id IS UNIQUE",
             "CREATE CONSTRAINT institution_id IF NOT EXISTS FOR (i:Institution) REQUIRE i.id IS UNIQUE",
             "CREATE CONSTRAINT topic_id IF NOT EXISTS FOR (t:Topic) REQUIRE t.id IS UNIQUE",
             "CREATE CONSTRAINT source_id IF NOT EXISTS FOR (s:Source) REQUIRE s.id IS UNIQUE",
-            
+        ]
+        
+        # Property indexes
+        index_stmts = [
             # Work indexes
             "CREATE INDEX work_year IF NOT EXISTS FOR (w:Work) ON (w.publication_year)",
             "CREATE INDEX work_type IF NOT EXISTS FOR (w:Work) ON (w.type)",
@@ -41,6 +117,8 @@ class SchemaSetup(BaseLoader):
             "CREATE INDEX institution_country IF NOT EXISTS FOR (i:Institution) ON (i.country_code)",
             "CREATE INDEX institution_type IF NOT EXISTS FOR (i:Institution) ON (i.type)",
             "CREATE INDEX institution_name IF NOT EXISTS FOR (i:Institution) ON (i.display_name)",
+            "CREATE INDEX institution_ror IF NOT EXISTS FOR (i:Institution) ON (i.ror)",
+            "CREATE INDEX institution_paper_count IF NOT EXISTS FOR (i:Institution) ON (i.paper_count)",
             
             # Topic indexes
             "CREATE INDEX topic_name IF NOT EXISTS FOR (t:Topic) ON (t.display_name)",
@@ -50,42 +128,46 @@ class SchemaSetup(BaseLoader):
             # Source indexes
             "CREATE INDEX source_name IF NOT EXISTS FOR (s:Source) ON (s.display_name)",
             "CREATE INDEX source_publisher IF NOT EXISTS FOR (s:Source) ON (s.publisher)",
+            "CREATE INDEX source_is_oa IF NOT EXISTS FOR (s:Source) ON (s.is_oa)",
         ]
         
-        # Execute each statement individually
-        for i, statement in enumerate(statements, 1):
-            try:
-                with self.driver.session() as session:
-                    session.run(statement)
-                print(f"  ✓ [{i}/{len(statements)}] {statement[:60]}...")
-            except Exception as e:
-                # If constraint/index already exists, that's okay
-                if "already exists" in str(e).lower() or "equivalent" in str(e).lower():
-                    print(f"  ○ [{i}/{len(statements)}] Already exists: {statement[:60]}...")
-                else:
-                    print(f"  ✗ [{i}/{len(statements)}] Error: {str(e)}")
-                    raise
-        
-        # Wait for indexes to be built
-        print("\nWaiting for indexes to be built...")
-        self.run_query("CALL db.awaitIndexes(300)", "Waiting for indexes...")
+        with self.driver.session() as session:
+            if self._has_apoc_schema_assert(session):
+                print("  Using apoc.schema.assert")
+                self._assert_schema_apoc(session)
+            else:
+                print("  ○ APOC not available, creating rules with Cypher DDL")
+                self._apply_groups(session, constraint_stmts, index_stmts)
+            
+            # Wait once for every populating index to come online
+            print("\nWaiting for indexes to be built...")
+            start_time = time.time()
+            session.run("CALL db.awaitIndexes($t)", t=300).consume()
+            print(f"✓ Indexes online in {time.time() - start_time:.2f}s")
+    
+    def _apply_groups(self, session, constraint_stmts, index_stmts):
+        """Apply constraints, then indexes, each as one transaction"""
+        # Index builds run in the background once committed, so constraint
+        # population and index population overlap; nothing waits until the end
+        self._apply_schema(session, "constraints", constraint_stmts)
+        self._apply_schema(session, "indexes", index_stmts)
+    
+    @staticmethod
+    def _count_schema(tx):
+        """Count constraints and indexes within one read transaction"""
+        # SHOW commands can't be combined with UNION or CALL subqueries, so
+        # both run in the same transaction on one session instead
+        constraints = tx.run("SHOW CONSTRAINTS YIELD name RETURN count(*) AS n").single()["n"]
+        indexes = tx.run("SHOW INDEXES YIELD name RETURN count(*) AS n").single()["n"]
+        return constraints, indexes
     
     def verify_schema(self):
         """Verify all constraints and indexes were created"""
-        # Check constraints
-        constraints_query = "SHOW CONSTRAINTS"
-        print("\nVerifying constraints...")
-        records, _ = self.run_query(constraints_query)
+        print("\nVerifying constraints and indexes...")
+        with self.driver.session() as session:
+            constraint_count, index_count = session.execute_read(self._count_schema)
         
-        constraint_count = len(records)
         print(f"  Found {constraint_count} constraints")
-        
-        # Check indexes
-        indexes_query = "SHOW INDEXES"
-        print("\nVerifying indexes...")
-        records, _ = self.run_query(indexes_query)
-        
-        index_count = len(records)
         print(f"  Found {index_count} indexes")
         
         return constraint_count >= 5  # At least 5 constraints for our node types
@@ -103,6 +185,9 @@ class SchemaSetup(BaseLoader):
         try:
             self.setup_schema()
             
+            # Fresh filter tables for this load; the loaders only read them
+            self.ensure_relevant_works(rebuild=True)
+            
             if self.verify_schema():
                 print("\n✓ Schema setup successful!")
                 self.print_summary(time.time() - start_time)
@@ -120,8 +205,8 @@ class SchemaSetup(BaseLoader):
             self.close()
 
 
-def main():
-    setup = SchemaSetup()
+def main(**connections):
+    setup = SchemaSetup(**connections)
     success = setup.run()
     
     if success:
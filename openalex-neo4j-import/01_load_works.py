@@ -5,87 +5,75 @@ Load Work nodes from PostgreSQL to Neo4j
 Based on: mvp_extract_01_works.sql
 Expected: ~69K nodes (Polymers & Plastics 2024)
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, BATCH_SIZE
 import time
 
 
 class WorksLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 1: Loading Works")
+    def __init__(self, **connections):
+        super().__init__("Step 1: Loading Works", **connections)
     
     def load_works(self):
         """Load Work nodes using APOC periodic iterate"""
         print("\nLoading Work nodes from PostgreSQL...")
         
-        # Build the complete Cypher query
-        # Note: The SQL query is passed as a literal string to apoc.load.jdbc
-        # We use $$ to avoid quote escaping issues
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MERGE (w:Work {id: row.id})
-             SET w.doi = row.doi,
-                 w.title = row.title,
-                 w.display_name = row.display_name,
-                 w.publication_year = row.publication_year,
-                 w.publication_date = row.publication_date,
-                 w.type = row.type,
-                 w.cited_by_count = row.cited_by_count,
-                 w.is_retracted = row.is_retracted,
-                 w.is_paratext = row.is_paratext,
-                 w.language = row.language,
-                 w.loaded_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Node MERGEs on distinct ids don't contend, so batches run in parallel;
+        # the constraint keeps each MERGE an index seek
+        self.ensure_unique_constraint("Work")
+        
+        # Per-row Cypher; the source row is bound to `row`. Descriptive
+        # properties are only written on create, so a re-run rewrites just
+        # the ones that change between OpenAlex snapshots
+        cypher = """
+        MERGE (w:Work {id: row.id})
+        ON CREATE SET w.doi = row.doi,
+                      w.title = row.title,
+                      w.display_name = row.display_name,
+                      w.publication_year = row.publication_year,
+                      w.publication_date = row.publication_date,
+                      w.type = row.type,
+                      w.is_paratext = row.is_paratext,
+                      w.language = row.language
+        SET w.cited_by_count = row.cited_by_count,
+            w.is_retracted = row.is_retracted
         """
         
-        # Parameters to pass to the query
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT w.id, w.doi, w.title, w.display_name, w.publication_year, 
+        sql = """SELECT w.id, w.doi, w.title, w.display_name, w.publication_year, 
                 w.publication_date, w.type, w.cited_by_count, 
                 COALESCE(w.is_retracted, false) as is_retracted,
                 COALESCE(w.is_paratext, false) as is_paratext, w.language
-         FROM openalex.works w
-         JOIN openalex.works_topics wt ON w.id = wt.work_id
-         JOIN openalex.topics t ON wt.topic_id = t.id
-         WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-         AND w.publication_year = 2024"""
-        }
+         FROM staging.relevant_works rw
+         JOIN openalex.works w ON w.id = rw.id"""
         
         print("Executing query...")
         start_time = time.time()
         
-        # Execute with parameters
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        records = self.load(sql, cypher, batch_size=BATCH_SIZE, parallel=True, concurrency=8, retries=3)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     
     def verify_works(self):
         """Verify works were loaded"""
+        # Each subquery is answered from the count store or an index
+        # (work_year, work_doi) instead of scanning every Work
         query = """
-        MATCH (w:Work)
-        RETURN count(w) as total_works,
-               min(w.publication_year) as earliest_year,
-               max(w.publication_year) as latest_year,
-               count(w.doi) as works_with_doi
+        CALL { MATCH (w:Work) RETURN count(w) as total_works }
+        CALL { MATCH (w:Work) WHERE w.publication_year IS NOT NULL
+               RETURN min(w.publication_year) as earliest_year,
+                      max(w.publication_year) as latest_year }
+        CALL { MATCH (w:Work) WHERE w.doi IS NOT NULL RETURN count(w) as works_with_doi }
+        RETURN total_works, earliest_year, latest_year, works_with_doi
         """
         
         print("\nVerifying Works...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_works'] > 0:
+        if summary and summary['total_works'] > 0:
             print(f"✓ Successfully loaded works!")
             return True
         else:
@@ -103,7 +91,10 @@ class WorksLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_works()
+            self.ensure_relevant_works()
+            expected = self.pg_count("staging.relevant_works")
+            if self.needs_load("MATCH (n:Work) RETURN count(n) AS n", expected):
+                self.load_works()
             
             if self.verify_works():
                 self.print_summary(time.time() - start_time)
@@ -120,8 +111,8 @@ class WorksLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = WorksLoader()
+def main(**connections):
+    loader = WorksLoader(**connections)
     success = loader.run()
     
     if success:
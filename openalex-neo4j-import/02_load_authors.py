@@ -5,78 +5,64 @@ Load Author nodes from PostgreSQL to Neo4j
 Based on: mvp_extract_02_authors.sql
 Expected: ~100K-150K nodes
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, BATCH_SIZE
 import time
 
 
 class AuthorsLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 2: Loading Authors")
+    def __init__(self, **connections):
+        super().__init__("Step 2: Loading Authors", **connections)
     
     def load_authors(self):
         """Load Author nodes using APOC periodic iterate"""
         print("\nLoading Author nodes from PostgreSQL...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MERGE (a:Author {id: row.id})
-             SET a.orcid = row.orcid,
-                 a.display_name = row.display_name,
-                 a.display_name_alternatives = row.display_name_alternatives,
-                 a.works_count = row.works_count,
-                 a.cited_by_count = row.cited_by_count,
-                 a.loaded_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Node MERGEs on distinct ids don't contend, so batches run in parallel;
+        # the constraint keeps each MERGE an index seek
+        self.ensure_unique_constraint("Author")
+        
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MERGE (a:Author {id: row.id})
+        ON CREATE SET a.orcid = row.orcid,
+                      a.display_name = row.display_name,
+                      a.display_name_alternatives = row.display_name_alternatives
+        SET a.works_count = row.works_count,
+            a.cited_by_count = row.cited_by_count
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT a.id, a.orcid, a.display_name, a.display_name_alternatives, a.works_count, a.cited_by_count
-                 FROM openalex.authors a
-                 WHERE a.id IN (
-                     SELECT DISTINCT wa.author_id
-                     FROM openalex.works_authorships wa
-                     JOIN openalex.works w ON wa.work_id = w.id
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                     AND wa.author_id IS NOT NULL
-                 )"""
-        }
+        # Empty strings become NULL, which Neo4j doesn't store as a property
+        sql = """SELECT a.id, NULLIF(a.orcid, '') AS orcid, a.display_name, a.display_name_alternatives, a.works_count, a.cited_by_count
+                 FROM staging.relevant_authors ra
+                 JOIN openalex.authors a ON a.id = ra.id"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        records = self.load(sql, cypher, batch_size=BATCH_SIZE, parallel=True, concurrency=8, retries=3)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_authors(self):
         """Verify authors were loaded"""
+        # Each subquery is answered from the count store or an index
+        # (author_orcid, author_works_count) instead of scanning every Author
         query = """
-        MATCH (a:Author)
-        RETURN count(a) as total_authors,
-               count(a.orcid) as authors_with_orcid,
-               avg(a.works_count) as avg_works_per_author
+        CALL { MATCH (a:Author) RETURN count(a) as total_authors }
+        CALL { MATCH (a:Author) WHERE a.orcid IS NOT NULL RETURN count(a) as authors_with_orcid }
+        CALL { MATCH (a:Author) WHERE a.works_count IS NOT NULL
+               RETURN avg(a.works_count) as avg_works_per_author }
+        RETURN total_authors, authors_with_orcid, avg_works_per_author
         """
         
         print("\nVerifying Authors...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_authors'] > 0:
+        if summary and summary['total_authors'] > 0:
             print(f"✓ Successfully loaded authors!")
             return True
         else:
@@ -94,7 +80,10 @@ class AuthorsLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_authors()
+            self.ensure_relevant_works()
+            expected = self.pg_count("staging.relevant_authors ra JOIN openalex.authors a ON a.id = ra.id")
+            if self.needs_load("MATCH (n:Author) RETURN count(n) AS n", expected):
+                self.load_authors()
             
             if self.verify_authors():
                 self.print_summary(time.time() - start_time)
@@ -111,8 +100,8 @@ class AuthorsLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = AuthorsLoader()
+def main(**connections):
+    loader = AuthorsLoader(**connections)
     success = loader.run()
     
     if success:
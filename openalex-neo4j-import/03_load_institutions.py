@@ -4,79 +4,67 @@
 Load Institution nodes from PostgreSQL to Neo4j
 Expected: ~5K-10K nodes
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, BATCH_SIZE
 import time
 
 
 class InstitutionsLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 3: Loading Institutions")
+    def __init__(self, **connections):
+        super().__init__("Step 3: Loading Institutions", **connections)
     
     def load_institutions(self):
         """Load Institution nodes using APOC periodic iterate"""
         print("\nLoading Institution nodes from PostgreSQL...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MERGE (i:Institution {id: row.id})
-             SET i.ror = row.ror,
-                 i.display_name = row.display_name,
-                 i.country_code = row.country_code,
-                 i.type = row.type,
-                 i.homepage_url = row.homepage_url,
-                 i.works_count = row.works_count,
-                 i.cited_by_count = row.cited_by_count,
-                 i.loaded_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Node MERGEs on distinct ids don't contend, so batches run in parallel;
+        # the constraint keeps each MERGE an index seek
+        self.ensure_unique_constraint("Institution")
+        
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MERGE (i:Institution {id: row.id})
+        ON CREATE SET i.ror = row.ror,
+                      i.display_name = row.display_name,
+                      i.country_code = row.country_code,
+                      i.type = row.type,
+                      i.homepage_url = row.homepage_url
+        SET i.works_count = row.works_count,
+            i.cited_by_count = row.cited_by_count
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT DISTINCT i.id, i.ror, i.display_name, i.country_code, i.type,
-                        i.homepage_url, i.works_count, i.cited_by_count
-                 FROM openalex.institutions i
-                 WHERE i.id IN (
-                     SELECT DISTINCT wa.institution_id
-                     FROM openalex.works_authorships wa
-                     JOIN openalex.works w ON wa.work_id = w.id
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                     AND wa.institution_id IS NOT NULL
-                 )"""
-        }
+        # Empty strings become NULL, which Neo4j doesn't store as a property
+        sql = """SELECT i.id, NULLIF(i.ror, '') AS ror, i.display_name, i.country_code, i.type,
+                        NULLIF(i.homepage_url, '') AS homepage_url, i.works_count, i.cited_by_count
+                 FROM staging.relevant_institutions ri
+                 JOIN openalex.institutions i ON i.id = ri.id"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        records = self.load(sql, cypher, batch_size=BATCH_SIZE, parallel=True, concurrency=8, retries=3)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_institutions(self):
         """Verify institutions were loaded"""
-        query = """MATCH (i:Institution)
-        RETURN count(i) as total_institutions,
-               count(DISTINCT i.country_code) as countries,
-               count(i.ror) as institutions_with_ror"""
+        # Each subquery is answered from the count store or an index
+        # (institution_country, institution_ror) instead of a label scan
+        query = """
+        CALL { MATCH (i:Institution) RETURN count(i) as total_institutions }
+        CALL { MATCH (i:Institution) WHERE i.country_code IS NOT NULL
+               RETURN count(DISTINCT i.country_code) as countries }
+        CALL { MATCH (i:Institution) WHERE i.ror IS NOT NULL RETURN count(i) as institutions_with_ror }
+        RETURN total_institutions, countries, institutions_with_ror
+        """
         
         print("\nVerifying Institutions...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_institutions'] > 0:
+        if summary and summary['total_institutions'] > 0:
             print(f"✓ Successfully loaded institutions!")
             return True
         else:
@@ -94,7 +82,10 @@ class InstitutionsLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_institutions()
+            self.ensure_relevant_works()
+            expected = self.pg_count("staging.relevant_institutions ri JOIN openalex.institutions i ON i.id = ri.id")
+            if self.needs_load("MATCH (n:Institution) RETURN count(n) AS n", expected):
+                self.load_institutions()
             
             if self.verify_institutions():
                 self.print_summary(time.time() - start_time)
@@ -111,8 +102,8 @@ class InstitutionsLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = InstitutionsLoader()
+def main(**connections):
+    loader = InstitutionsLoader(**connections)
     success = loader.run()
     
     if success:
@@ -4,87 +4,77 @@
 Load Topic nodes from PostgreSQL to Neo4j
 Expected: ~2K-5K nodes
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, BATCH_SIZE
 import time
 
 
 class TopicsLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 4: Loading Topics")
+    def __init__(self, **connections):
+        super().__init__("Step 4: Loading Topics", **connections)
     
     def load_topics(self):
         """Load Topic nodes using APOC periodic iterate"""
         print("\nLoading Topic nodes from PostgreSQL...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MERGE (t:Topic {id: row.id})
-             SET t.display_name = row.display_name,
-                 t.subfield_id = row.subfield_id,
-                 t.subfield_display_name = row.subfield_display_name,
-                 t.field_id = row.field_id,
-                 t.field_display_name = row.field_display_name,
-                 t.domain_id = row.domain_id,
-                 t.domain_display_name = row.domain_display_name,
-                 t.description = row.description,
-                 t.keywords = row.keywords,
-                 t.works_count = row.works_count,
-                 t.cited_by_count = row.cited_by_count,
-                 t.loaded_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Node MERGEs on distinct ids don't contend, so batches run in parallel;
+        # the constraint keeps each MERGE an index seek
+        self.ensure_unique_constraint("Topic")
+        
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MERGE (t:Topic {id: row.id})
+        ON CREATE SET t.display_name = row.display_name,
+                      t.subfield_id = row.subfield_id,
+                      t.subfield_display_name = row.subfield_display_name,
+                      t.field_id = row.field_id,
+                      t.field_display_name = row.field_display_name,
+                      t.domain_id = row.domain_id,
+                      t.domain_display_name = row.domain_display_name,
+                      t.description = row.description,
+                      t.keywords = row.keywords
+        SET t.works_count = row.works_count,
+            t.cited_by_count = row.cited_by_count
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT t.id, t.display_name, t.subfield_id, t.subfield_display_name,
+        sql = """SELECT t.id, t.display_name, t.subfield_id, t.subfield_display_name,
                         t.field_id, t.field_display_name, t.domain_id, t.domain_display_name,
                         t.description, t.keywords, t.works_count, t.cited_by_count
                  FROM openalex.topics t
-                 WHERE t.id IN (
-                     SELECT DISTINCT wt.topic_id
+                 WHERE EXISTS (
+                     SELECT 1
                      FROM openalex.works_topics wt
-                     JOIN openalex.works w ON wt.work_id = w.id
-                     WHERE w.id IN (
-                         SELECT DISTINCT w2.id
-                         FROM openalex.works w2
-                         JOIN openalex.works_topics wt2 ON w2.id = wt2.work_id
-                         JOIN openalex.topics t2 ON wt2.topic_id = t2.id
-                         WHERE t2.subfield_id = 'https://openalex.org/subfields/2507'
-                         AND w2.publication_year = 2024
-                     )
+                     JOIN staging.relevant_works rw ON wt.work_id = rw.id
+                     WHERE wt.topic_id = t.id
                  )"""
-        }
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        records = self.load(sql, cypher, batch_size=BATCH_SIZE, parallel=True, concurrency=8, retries=3)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_topics(self):
         """Verify topics were loaded"""
-        query = """MATCH (t:Topic)
-        RETURN count(t) as total_topics,
-               count(DISTINCT t.subfield_id) as unique_subfields,
-               count(DISTINCT t.field_id) as unique_fields"""
+        # Each subquery is answered from the count store or an index
+        # (topic_subfield, topic_field) instead of a label scan
+        query = """
+        CALL { MATCH (t:Topic) RETURN count(t) as total_topics }
+        CALL { MATCH (t:Topic) WHERE t.subfield_id IS NOT NULL
+               RETURN count(DISTINCT t.subfield_id) as unique_subfields }
+        CALL { MATCH (t:Topic) WHERE t.field_id IS NOT NULL
+               RETURN count(DISTINCT t.field_id) as unique_fields }
+        RETURN total_topics, unique_subfields, unique_fields
+        """
         
         print("\nVerifying Topics...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_topics'] > 0:
+        if summary and summary['total_topics'] > 0:
             print(f"✓ Successfully loaded topics!")
             return True
         else:
@@ -102,7 +92,19 @@ class TopicsLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_topics()
+            self.ensure_relevant_works()
+            expected = self.pg_count("""(
+                SELECT 1
+                FROM openalex.topics t
+                WHERE EXISTS (
+                    SELECT 1
+                    FROM openalex.works_topics wt
+                    JOIN staging.relevant_works rw ON wt.work_id = rw.id
+                    WHERE wt.topic_id = t.id
+                )
+            ) relevant_topics""")
+            if self.needs_load("MATCH (n:Topic) RETURN count(n) AS n", expected):
+                self.load_topics()
             
             if self.verify_topics():
                 self.print_summary(time.time() - start_time)
@@ -119,8 +121,8 @@ class TopicsLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = TopicsLoader()
+def main(**connections):
+    loader = TopicsLoader(**connections)
     success = loader.run()
     
     if success:
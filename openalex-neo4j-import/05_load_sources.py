@@ -4,81 +4,70 @@
 Load Source nodes from PostgreSQL to Neo4j
 Expected: ~1K-2K nodes
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, BATCH_SIZE
 import time
 
 
 class SourcesLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 5: Loading Sources")
+    def __init__(self, **connections):
+        super().__init__("Step 5: Loading Sources", **connections)
     
     def load_sources(self):
         """Load Source nodes using APOC periodic iterate"""
         print("\nLoading Source nodes from PostgreSQL...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MERGE (s:Source {id: row.id})
-             SET s.issn_l = row.issn_l,
-                 s.issn = row.issn,
-                 s.display_name = row.display_name,
-                 s.publisher = row.publisher,
-                 s.works_count = row.works_count,
-                 s.cited_by_count = row.cited_by_count,
-                 s.is_oa = row.is_oa,
-                 s.is_in_doaj = row.is_in_doaj,
-                 s.homepage_url = row.homepage_url,
-                 s.loaded_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Node MERGEs on distinct ids don't contend, so batches run in parallel;
+        # the constraint keeps each MERGE an index seek
+        self.ensure_unique_constraint("Source")
+        
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MERGE (s:Source {id: row.id})
+        ON CREATE SET s.issn_l = row.issn_l,
+                      s.issn = row.issn,
+                      s.display_name = row.display_name,
+                      s.publisher = row.publisher,
+                      s.homepage_url = row.homepage_url
+        SET s.works_count = row.works_count,
+            s.cited_by_count = row.cited_by_count,
+            s.is_oa = row.is_oa,
+            s.is_in_doaj = row.is_in_doaj
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT s.id, s.issn_l, s.issn, s.display_name, s.publisher,
-                        s.works_count, s.cited_by_count, s.is_oa, s.is_in_doaj, s.homepage_url
-                 FROM openalex.sources s
-                 WHERE s.id IN (
-                     SELECT DISTINCT wpl.source_id
-                     FROM openalex.works_primary_locations wpl
-                     JOIN openalex.works w ON wpl.work_id = w.id
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                     AND wpl.source_id IS NOT NULL
-                 )"""
-        }
+        # Empty strings become NULL, which Neo4j doesn't store as a property
+        sql = """SELECT s.id, NULLIF(s.issn_l, '') AS issn_l, s.issn, s.display_name,
+                        NULLIF(s.publisher, '') AS publisher, s.works_count, s.cited_by_count,
+                        s.is_oa, s.is_in_doaj, NULLIF(s.homepage_url, '') AS homepage_url
+                 FROM staging.relevant_sources rs
+                 JOIN openalex.sources s ON s.id = rs.id"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        records = self.load(sql, cypher, batch_size=BATCH_SIZE, parallel=True, concurrency=8, retries=3)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_sources(self):
         """Verify sources were loaded"""
-        query = """MATCH (s:Source)
-        RETURN count(s) as total_sources,
-               count(DISTINCT s.publisher) as unique_publishers,
-               sum(CASE WHEN s.is_oa = true THEN 1 ELSE 0 END) as open_access_sources"""
+        # Each subquery is answered from the count store or an index
+        # (source_publisher, source_is_oa) instead of scanning every Source
+        query = """
+        CALL { MATCH (s:Source) RETURN count(s) as total_sources }
+        CALL { MATCH (s:Source) WHERE s.publisher IS NOT NULL
+               RETURN count(DISTINCT s.publisher) as unique_publishers }
+        CALL { MATCH (s:Source) WHERE s.is_oa = true RETURN count(s) as open_access_sources }
+        RETURN total_sources, unique_publishers, open_access_sources
+        """
         
         print("\nVerifying Sources...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_sources'] > 0:
+        if summary and summary['total_sources'] > 0:
             print(f"✓ Successfully loaded sources!")
             return True
         else:
@@ -96,7 +85,10 @@ class SourcesLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_sources()
+            self.ensure_relevant_works()
+            expected = self.pg_count("staging.relevant_sources rs JOIN openalex.sources s ON s.id = rs.id")
+            if self.needs_load("MATCH (n:Source) RETURN count(n) AS n", expected):
+                self.load_sources()
             
             if self.verify_sources():
                 self.print_summary(time.time() - start_time)
@@ -113,8 +105,8 @@ class SourcesLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = SourcesLoader()
+def main(**connections):
+    loader = SourcesLoader(**connections)
     success = loader.run()
     
     if success:
@@ -5,76 +5,71 @@ Load AUTHORED relationships (Author → Work)
 Based on: mvp_extract_03_authorships.sql
 Expected: ~400K-600K relationships
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, rel_batch_size
 import time
 
 
 class AuthoredLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 6: Loading AUTHORED Relationships")
+    def __init__(self, **connections):
+        super().__init__("Step 6: Loading AUTHORED Relationships", **connections)
     
     def load_authored(self):
         """Load AUTHORED relationships"""
         print("\nLoading AUTHORED relationships...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MATCH (a:Author {id: row.author_id})
-             MATCH (w:Work {id: row.work_id})
-             MERGE (a)-[r:AUTHORED]->(w)
-             SET r.author_position = row.author_position,
-                 r.institution_id = row.institution_id,
-                 r.created_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Both endpoint MATCHes must be unique-index seeks; MATCH rather than
+        # MERGE, so a row whose Author or Work wasn't loaded is skipped
+        # instead of creating a stub node
+        self.ensure_unique_constraint("Author")
+        self.ensure_unique_constraint("Work")
+        
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MATCH (a:Author {id: row.author_id})
+        MATCH (w:Work {id: row.work_id})
+        MERGE (a)-[r:AUTHORED]->(w)
+        SET r.author_position = row.author_position,
+            r.institution_id = row.institution_id
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT wa.work_id, wa.author_id, wa.author_position, wa.institution_id
+        # {shard_filter} is filled in per shard by run_sharded
+        sql_template = """SELECT wa.work_id, wa.author_id, wa.author_position, wa.institution_id
                  FROM openalex.works_authorships wa
-                 WHERE wa.work_id IN (
-                     SELECT DISTINCT w.id
-                     FROM openalex.works w
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                 )
-                 AND wa.author_id IS NOT NULL"""
-        }
+                 JOIN staging.relevant_works rw ON wa.work_id = rw.id
+                 WHERE wa.author_id IS NOT NULL
+                 {shard_filter}"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        # Same scheme as 09: shards on the Work side, each streaming UNWIND
+        # batches over Bolt. An Author shared by two shards can still deadlock
+        # a pair of batches; execute_write retries those transactions
+        records = self.run_sharded(sql_template, "wa.work_id", cypher,
+                                   transport="bolt", bolt_batch_size=rel_batch_size("AUTHORED"))
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_authored(self):
         """Verify AUTHORED relationships were created"""
+        # The total comes from the count store; only the position
+        # breakdown reads relationship properties
         query = """
-        MATCH ()-[r:AUTHORED]->()
-        RETURN count(r) as total_authorships,
-               sum(CASE WHEN r.author_position = 'first' THEN 1 ELSE 0 END) as first_author,
-               sum(CASE WHEN r.author_position = 'last' THEN 1 ELSE 0 END) as last_author
+        CALL { MATCH ()-[r:AUTHORED]->() RETURN count(r) as total_authorships }
+        CALL { MATCH ()-[r:AUTHORED]->()
+               RETURN sum(CASE WHEN r.author_position = 'first' THEN 1 ELSE 0 END) as first_author,
+                      sum(CASE WHEN r.author_position = 'last' THEN 1 ELSE 0 END) as last_author }
+        RETURN total_authorships, first_author, last_author
         """
         
         print("\nVerifying AUTHORED relationships...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_authorships'] > 0:
+        if summary and summary['total_authorships'] > 0:
             print(f"✓ Successfully created AUTHORED relationships!")
             return True
         else:
@@ -92,7 +87,11 @@ class AuthoredLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_authored()
+            self.ensure_relevant_works()
+            if self.needs_load("MATCH ()-[r:AUTHORED]->() RETURN count(r) AS n"):
+                self.warmup("Author")
+                self.warmup("Work")
+                self.load_authored()
             
             if self.verify_authored():
                 self.print_summary(time.time() - start_time)
@@ -109,8 +108,8 @@ class AuthoredLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = AuthoredLoader()
+def main(**connections):
+    loader = AuthoredLoader(**connections)
     success = loader.run()
     
     if success:
@@ -4,69 +4,119 @@
 Load AFFILIATED_WITH relationships (Author → Institution)
 Expected: ~100K-200K relationships
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, rel_batch_size
 import time
 
+# LoadRun steps behind Institution.paper_count: AUTHORED_STEP must match
+# 06_load_authored.py's script name; the counts record their own LoadRun
+AUTHORED_STEP = "Step 6: Loading AUTHORED Relationships"
+PAPER_COUNT_STEP = "Step 7: Computing Institution.paper_count"
+
 
 class AffiliatedWithLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 7: Loading AFFILIATED_WITH Relationships")
+    def __init__(self, **connections):
+        super().__init__("Step 7: Loading AFFILIATED_WITH Relationships", **connections)
     
     def load_affiliated_with(self):
         """Load AFFILIATED_WITH relationships"""
         print("\nLoading AFFILIATED_WITH relationships...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MATCH (a:Author {id: row.author_id})
-             MATCH (i:Institution {id: row.institution_id})
-             MERGE (a)-[r:AFFILIATED_WITH]->(i)
-             ON CREATE SET r.first_seen = row.publication_year,
-                           r.last_seen = row.publication_year
-             ON MATCH SET r.last_seen = CASE 
-                 WHEN row.publication_year > r.last_seen 
-                 THEN row.publication_year 
-                 ELSE r.last_seen 
-             END',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MATCH (a:Author {id: row.author_id})
+        MATCH (i:Institution {id: row.institution_id})
+        MERGE (a)-[r:AFFILIATED_WITH]->(i)
+        ON CREATE SET r.first_seen = row.first_seen,
+                      r.last_seen = row.last_seen
+        ON MATCH SET r.first_seen = CASE
+                         WHEN row.first_seen < r.first_seen THEN row.first_seen
+                         ELSE r.first_seen
+                     END,
+                     r.last_seen = CASE
+                         WHEN row.last_seen > r.last_seen THEN row.last_seen
+                         ELSE r.last_seen
+                     END
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT DISTINCT wa.author_id, wa.institution_id, w.publication_year
+        # One row per (author, institution) pair: the year range is folded in
+        # SQL, so Neo4j sees each relationship once instead of once per work.
+        # {shard_filter} is filled in per shard by run_sharded
+        sql_template = """SELECT wa.author_id, wa.institution_id,
+                        MIN(w.publication_year) AS first_seen,
+                        MAX(w.publication_year) AS last_seen
                  FROM openalex.works_authorships wa
+                 JOIN staging.relevant_works rw ON wa.work_id = rw.id
                  JOIN openalex.works w ON wa.work_id = w.id
-                 WHERE wa.work_id IN (
-                     SELECT DISTINCT w2.id
-                     FROM openalex.works w2
-                     JOIN openalex.works_topics wt ON w2.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w2.publication_year = 2024
-                 )
-                 AND wa.author_id IS NOT NULL
-                 AND wa.institution_id IS NOT NULL"""
-        }
+                 WHERE wa.author_id IS NOT NULL
+                 AND wa.institution_id IS NOT NULL
+                 {shard_filter}
+                 GROUP BY wa.author_id, wa.institution_id"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        # Endpoint locks make parallel: true deadlock-prone here, so the source
+        # rows are hash-partitioned on wa.author_id and the shards run side by side.
+        # Each shard streams 10K-row UNWIND batches over Bolt: one plan and one
+        # commit per batch for the two endpoint seeks and the MERGE
+        records = self.run_sharded(sql_template, "wa.author_id", cypher,
+                                   transport="bolt", bolt_batch_size=rel_batch_size("AFFILIATED_WITH", 10000))
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
+    
+    def compute_paper_counts(self):
+        """
+        Store on each Institution the number of distinct Works by its authors
+        
+        Step 12's top-institutions report reads this through the
+        institution_paper_count index instead of expanding AFFILIATED_WITH
+        and AUTHORED for every Institution. AUTHORED is loaded by step 6,
+        which always runs before this one. Records a LoadRun under
+        PAPER_COUNT_STEP, which paper_counts_stale compares against.
+        """
+        print("\nComputing Institution.paper_count...")
+        start_time = time.time()
+        
+        query = """
+        MATCH (i:Institution)
+        CALL {
+            WITH i
+            OPTIONAL MATCH (i)<-[:AFFILIATED_WITH]-(:Author)-[:AUTHORED]->(w:Work)
+            WITH i, count(DISTINCT w) AS papers
+            SET i.paper_count = papers
+        } IN TRANSACTIONS OF 1000 ROWS
+        RETURN count(*) AS total
+        """
+        # CALL {} IN TRANSACTIONS needs an auto-commit transaction
+        with self.driver.session() as session:
+            records = [session.run(query).single().data()]
+        
+        print(f"✓ Completed in {time.time() - start_time:.2f}s")
+        self.record_load(records, step=PAPER_COUNT_STEP)
+    
+    def paper_counts_stale(self):
+        """
+        Whether Institution.paper_count misses the latest AUTHORED or AFFILIATED_WITH
+        
+        True when the counts were never computed, or when step 6 or this
+        step recorded a load after the last compute_paper_counts, e.g. step
+        6 rerun with --force or for new works while this load was skipped.
+        """
+        query = """
+        CALL { MATCH (r:LoadRun {step: $counts_step}) RETURN max(r.at) AS counted }
+        CALL { MATCH (r:LoadRun) WHERE r.step IN $source_steps RETURN max(r.at) AS loaded }
+        RETURN counted IS NULL OR loaded > counted AS stale
+        """
+        summary = self.run_summary_query(query, counts_step=PAPER_COUNT_STEP,
+                                         source_steps=[AUTHORED_STEP, self.script_name])
+        # Without a result the counts can't be shown current, so recompute
+        return summary is None or bool(summary['stale'])
+    
     def verify_affiliated_with(self):
         """Verify AFFILIATED_WITH relationships"""
         query = """
@@ -75,9 +125,9 @@ class AffiliatedWithLoader(BaseLoader):
         """
         
         print("\nVerifying AFFILIATED_WITH relationships...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_affiliations'] > 0:
+        if summary and summary['total_affiliations'] > 0:
             print(f"✓ Successfully created AFFILIATED_WITH relationships!")
             return True
         else:
@@ -93,7 +143,11 @@ class AffiliatedWithLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_affiliated_with()
+            self.ensure_relevant_works()
+            if self.needs_load("MATCH ()-[r:AFFILIATED_WITH]->() RETURN count(r) AS n"):
+                self.load_affiliated_with()
+            if self.paper_counts_stale():
+                self.compute_paper_counts()
             if self.verify_affiliated_with():
                 self.print_summary(time.time() - start_time)
                 return True
@@ -108,8 +162,8 @@ class AffiliatedWithLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = AffiliatedWithLoader()
+def main(**connections):
+    loader = AffiliatedWithLoader(**connections)
     success = loader.run()
     
     if success:
@@ -4,59 +4,44 @@
 Load TAGGED_WITH relationships (Work → Topic)
 Expected: ~200K-300K relationships
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, rel_batch_size
 import time
 
 
 class TaggedWithLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 8: Loading TAGGED_WITH Relationships")
+    def __init__(self, **connections):
+        super().__init__("Step 8: Loading TAGGED_WITH Relationships", **connections)
     
     def load_tagged_with(self):
         """Load TAGGED_WITH relationships"""
         print("\nLoading TAGGED_WITH relationships...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MATCH (w:Work {id: row.work_id})
-             MATCH (t:Topic {id: row.topic_id})
-             MERGE (w)-[r:TAGGED_WITH]->(t)
-             SET r.score = row.score,
-                 r.created_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MATCH (w:Work {id: row.work_id})
+        MATCH (t:Topic {id: row.topic_id})
+        MERGE (w)-[r:TAGGED_WITH]->(t)
+        SET r.score = row.score
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT wt.work_id, wt.topic_id, wt.score
+        # {shard_filter} is filled in per shard by run_sharded
+        sql_template = """SELECT wt.work_id, wt.topic_id, wt.score
                  FROM openalex.works_topics wt
-                 WHERE wt.work_id IN (
-                     SELECT DISTINCT w.id
-                     FROM openalex.works w
-                     JOIN openalex.works_topics wt2 ON w.id = wt2.work_id
-                     JOIN openalex.topics t ON wt2.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                 )
-                 AND wt.topic_id IS NOT NULL"""
-        }
+                 JOIN staging.relevant_works rw ON wt.work_id = rw.id
+                 WHERE wt.topic_id IS NOT NULL
+                 {shard_filter}"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        # ~1.4K Topics take every TAGGED_WITH, so shards split on the Topic
+        # side: each hot Topic is only ever locked by its own shard
+        records = self.run_sharded(sql_template, "wt.topic_id", cypher,
+                                   transport="bolt", bolt_batch_size=rel_batch_size("TAGGED_WITH", 10000))
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
@@ -68,9 +53,9 @@ class TaggedWithLoader(BaseLoader):
         """
         
         print("\nVerifying TAGGED_WITH relationships...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_tags'] > 0:
+        if summary and summary['total_tags'] > 0:
             print(f"✓ Successfully created TAGGED_WITH relationships!")
             return True
         else:
@@ -86,7 +71,9 @@ class TaggedWithLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_tagged_with()
+            self.ensure_relevant_works()
+            if self.needs_load("MATCH ()-[r:TAGGED_WITH]->() RETURN count(r) AS n"):
+                self.load_tagged_with()
             if self.verify_tagged_with():
                 self.print_summary(time.time() - start_time)
                 return True
@@ -101,8 +88,8 @@ class TaggedWithLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = TaggedWithLoader()
+def main(**connections):
+    loader = TaggedWithLoader(**connections)
     success = loader.run()
     
     if success:
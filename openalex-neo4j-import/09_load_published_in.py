@@ -4,60 +4,47 @@
 Load PUBLISHED_IN relationships (Work → Source)
 Expected: ~60K-70K relationships
 """
-from base_loader import BaseLoader
+from base_loader import BaseLoader, rel_batch_size
 import time
 
 
 class PublishedInLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 9: Loading PUBLISHED_IN Relationships")
+    def __init__(self, **connections):
+        super().__init__("Step 9: Loading PUBLISHED_IN Relationships", **connections)
     
     def load_published_in(self):
         """Load PUBLISHED_IN relationships"""
         print("\nLoading PUBLISHED_IN relationships...")
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MATCH (w:Work {id: row.work_id})
-             MATCH (s:Source {id: row.source_id})
-             MERGE (w)-[r:PUBLISHED_IN]->(s)
-             SET r.is_oa = row.is_oa,
-                 r.version = row.version,
-                 r.created_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        # Per-row Cypher; the source row is bound to `row`
+        cypher = """
+        MATCH (w:Work {id: row.work_id})
+        MATCH (s:Source {id: row.source_id})
+        MERGE (w)-[r:PUBLISHED_IN]->(s)
+        SET r.is_oa = row.is_oa,
+            r.version = row.version
         """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT wpl.work_id, wpl.source_id, wpl.is_oa, wpl.version
+        # {shard_filter} is filled in per shard by run_sharded
+        sql_template = """SELECT wpl.work_id, wpl.source_id, wpl.is_oa, wpl.version
                  FROM openalex.works_primary_locations wpl
-                 WHERE wpl.work_id IN (
-                     SELECT DISTINCT w.id
-                     FROM openalex.works w
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                 )
-                 AND wpl.source_id IS NOT NULL"""
-        }
+                 JOIN staging.relevant_works rw ON wpl.work_id = rw.id
+                 WHERE wpl.source_id IS NOT NULL
+                 {shard_filter}"""
         
         print("Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            records = list(result)
+        # Endpoint locks make parallel: true deadlock-prone here, so the source
+        # rows are hash-partitioned on wpl.work_id and the shards run side by side.
+        # Each shard streams 10K-row UNWIND batches over Bolt: one plan and one
+        # commit per batch for the two endpoint seeks and the MERGE
+        records = self.run_sharded(sql_template, "wpl.work_id", cypher,
+                                   transport="bolt", bolt_batch_size=rel_batch_size("PUBLISHED_IN", 10000))
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
@@ -69,9 +56,9 @@ class PublishedInLoader(BaseLoader):
         """
         
         print("\nVerifying PUBLISHED_IN relationships...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records and records[0]['total_publications'] > 0:
+        if summary and summary['total_publications'] > 0:
             print(f"✓ Successfully created PUBLISHED_IN relationships!")
             return True
         else:
@@ -87,7 +74,9 @@ class PublishedInLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_published_in()
+            self.ensure_relevant_works()
+            if self.needs_load("MATCH ()-[r:PUBLISHED_IN]->() RETURN count(r) AS n"):
+                self.load_published_in()
             if self.verify_published_in():
                 self.print_summary(time.time() - start_time)
                 return True
@@ -102,8 +91,8 @@ class PublishedInLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = PublishedInLoader()
+def main(**connections):
+    loader = PublishedInLoader(**connections)
     success = loader.run()
     
     if success:
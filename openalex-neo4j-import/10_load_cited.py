@@ -5,87 +5,80 @@ Load CITED relationships (Work → Work)
 Expected: ~50K-100K internal citations
 Note: This only loads internal citations (MVP → MVP)
 """
-from base_loader_20251105_0653 import BaseLoader
+from base_loader import BaseLoader, rel_batch_size
 import time
-### base_loader_20251105_0653 has a longer max connection time 
 
 class CitedLoader(BaseLoader):
-    def __init__(self):
-        super().__init__("Step 10: Loading CITED Relationships")
+    def __init__(self, **connections):
+        super().__init__("Step 10: Loading CITED Relationships", **connections)
     
-    def load_cited(self):
-        """Load CITED relationships"""
-        print("\nLoading CITED relationships...")
+    def load_cited(self, fresh=False):
+        """
+        Load CITED relationships
         
-        query = """
-        CALL apoc.periodic.iterate(
-            'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
-            'MATCH (citing:Work {id: row.citing_work_id})
-             MATCH (cited:Work {id: row.cited_work_id})
-             MERGE (citing)-[r:CITED]->(cited)
-             SET r.citation_type = \\'internal\\',
-                 r.created_at = datetime()',
-            {batchSize: 1000, parallel: false, params: {
-                jdbc_url: $jdbc_url_param,
-                sql_query: $sql_query_param
-            }}
-        )
-        YIELD batches, total, errorMessages
-        RETURN batches, total, errorMessages
+        fresh means the graph has no CITED yet: the source rows are
+        distinct and each lands in exactly one shard, so the relationships
+        are CREATEd without MERGE's check for an existing one.
         """
+        print("\nLoading CITED relationships...")
+        
+        # Per-row Cypher; the source row is bound to `row`. Each MATCH is a
+        # unique seek yielding at most one node per row, so the planner's
+        # CartesianProduct of the two is a 1x1 pairing; a USING JOIN hint
+        # would only add a hash build per batch
+        if fresh:
+            cypher = """
+            MATCH (citing:Work {id: row.citing_work_id})
+            MATCH (cited:Work {id: row.cited_work_id})
+            CREATE (citing)-[:CITED {citation_type: 'internal'}]->(cited)
+            """
+        else:
+            cypher = """
+            MATCH (citing:Work {id: row.citing_work_id})
+            MATCH (cited:Work {id: row.cited_work_id})
+            MERGE (citing)-[r:CITED]->(cited)
+            ON CREATE SET r.citation_type = 'internal'
+            """
         
-        params = {
-            'jdbc_url_param': self.jdbc_url,
-            'sql_query_param': """SELECT rw.work_id as citing_work_id, rw.referenced_work_id as cited_work_id
+        # {shard_filter} is filled in per group pair by run_binned
+        sql_template = """SELECT DISTINCT rw.work_id as citing_work_id, rw.referenced_work_id as cited_work_id
                  FROM openalex.works_referenced_works rw
-                 WHERE rw.work_id IN (
-                     SELECT DISTINCT w.id
-                     FROM openalex.works w
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                 )
-                 AND rw.referenced_work_id IN (
-                     SELECT DISTINCT w.id
-                     FROM openalex.works w
-                     JOIN openalex.works_topics wt ON w.id = wt.work_id
-                     JOIN openalex.topics t ON wt.topic_id = t.id
-                     WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
-                     AND w.publication_year = 2024
-                 )"""
-        }
+                 JOIN staging.relevant_works citing ON rw.work_id = citing.id
+                 JOIN staging.relevant_works cited ON rw.referenced_work_id = cited.id
+                 {shard_filter}"""
         
         print("Executing query...")
         start_time = time.time()
         
-        # Use explicit transaction with extended timeout for long-running operation
-        # Citation loading can take 10-30 minutes with large datasets
-        with self.driver.session() as session:
-            with session.begin_transaction(timeout=7200.0) as tx:  # 30 minute timeout
-                result = tx.run(query, params)
-                records = list(result)
-                tx.commit()
+        # Both ends are Works, so the rows are binned on both ids and loaded
+        # in rounds where no two concurrent invocations share a Work; each
+        # invocation streams UNWIND batches over Bolt
+        records = self.run_binned(sql_template, "rw.work_id", "rw.referenced_work_id", cypher,
+                                  transport="bolt", bolt_batch_size=rel_batch_size("CITED", 10000))
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
+        self.record_load(records)
         
         for record in records:
             print(f"  Result: {dict(record)}")
     def verify_cited(self):
         """Verify CITED relationships"""
+        # The total comes from the count store; only the distinct
+        # endpoint counts walk the relationships
         query = """
-        MATCH ()-[r:CITED]->()
-        RETURN count(r) as total_citations,
-               count(DISTINCT startNode(r)) as citing_works,
-               count(DISTINCT endNode(r)) as cited_works
+        CALL { MATCH ()-[r:CITED]->() RETURN count(r) as total_citations }
+        CALL { MATCH ()-[r:CITED]->()
+               RETURN count(DISTINCT startNode(r)) as citing_works,
+                      count(DISTINCT endNode(r)) as cited_works }
+        RETURN total_citations, citing_works, cited_works
         """
         
         print("\nVerifying CITED relationships...")
-        records, _ = self.run_query(query)
+        summary = self.run_summary_query(query)
         
-        if records:
-            citation_count = records[0]['total_citations']
+        if summary:
+            citation_count = summary['total_citations']
             if citation_count > 0:
                 print(f"✓ Successfully created CITED relationships!")
                 return True
@@ -106,7 +99,11 @@ class CitedLoader(BaseLoader):
         start_time = time.time()
         
         try:
-            self.load_cited()
+            self.ensure_relevant_works()
+            count_query = "MATCH ()-[r:CITED]->() RETURN count(r) AS n"
+            if self.needs_load(count_query):
+                self.warmup("Work")
+                self.load_cited(fresh=self.run_summary_query(count_query)['n'] == 0)
             if self.verify_cited():
                 self.print_summary(time.time() - start_time)
                 return True
@@ -121,8 +118,8 @@ class CitedLoader(BaseLoader):
             self.close()
 
 
-def main():
-    loader = CitedLoader()
+def main(**connections):
+    loader = CitedLoader(**connections)
     success = loader.run()
     
     if success:
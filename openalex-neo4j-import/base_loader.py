@@ -1,31 +1,224 @@
 """
 Base loader class for APOC-based Neo4j imports
 Provides common functionality for all loading scripts
+
+Set LOAD_TRANSPORT=bolt to stream rows PostgreSQL -> Python -> Neo4j over
+Bolt instead of having APOC pull them over JDBC (the default, "apoc").
 """
+import gzip
+import hashlib
+import itertools
+import json
 import os
+import pickle
+import re
+import sys
 import time
-from datetime import datetime
-from neo4j import GraphDatabase
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from neo4j import GraphDatabase, Query, READ_ACCESS
+from neo4j.exceptions import Neo4jError
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Rows per PgJDBC round trip when APOC reads from PostgreSQL
+JDBC_FETCH_SIZE = 10000
+
+# Most records run_query keeps from one result; the rest are discarded
+RUN_QUERY_LIMIT = 1000
+
+# How rows get from PostgreSQL into Neo4j: "apoc" (apoc.load.jdbc inside
+# apoc.periodic.iterate), "tx" (apoc.load.jdbc batched by Neo4j 5's own
+# CALL {} IN TRANSACTIONS) or "bolt" (psycopg cursor + UNWIND batches)
+LOAD_TRANSPORT = os.getenv('LOAD_TRANSPORT', 'apoc').lower()
+
+# Rows per apoc.periodic.iterate batch (one commit each) for node and
+# relationship loaders; tune per hardware
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', '10000'))
+REL_BATCH_SIZE = int(os.getenv('REL_BATCH_SIZE', '5000'))
+
+# Rows per UNWIND transaction on the bolt transport
+BOLT_BATCH_SIZE = 5000
+
+# Set SNAPSHOT_DIR to keep a local copy of each bolt-transport source query,
+# so reruns replay it from disk instead of querying PostgreSQL again
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR')
+
+# The loader's per-row Cypher and source SQL are passed in as parameters,
+# so neither needs quoting inside the outer statement
+APOC_ITERATE = """
+CALL apoc.periodic.iterate(
+    'CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row RETURN row',
+    $cypher,
+    $config
+)
+YIELD batches, total, failedBatches, failedOperations, errorMessages
+RETURN batches, total, failedBatches, failedOperations, errorMessages
+"""
+
+# CALL {} IN TRANSACTIONS takes the per-row Cypher inline (it cannot be a
+# parameter), between these two parts; it must run in an auto-commit
+# transaction, which session.run() is
+JDBC_IN_TRANSACTIONS_HEAD = """
+CALL apoc.load.jdbc($jdbc_url, $sql_query) YIELD row
+CALL {
+    WITH row
+"""
+JDBC_IN_TRANSACTIONS_TAIL = """
+} IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS total
+"""
+
+# Concurrent shards for relationship loads (see run_sharded)
+DEFAULT_SHARDS = max(2, (os.cpu_count() or 4) // 2)
+
+# Server memory the batch sizes above are sized for (see neo4j.conf.snippet);
+# test_connection() warns about settings below these
+MEMORY_MINIMUMS = {
+    'server.memory.heap.max_size': 8 * 1024**3,
+    'server.memory.pagecache.size': 4 * 1024**3,
+    'db.memory.transaction.total.max': 4 * 1024**3,
+    'db.memory.transaction.max': 512 * 1024**2,
+}
+SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3, 't': 1024**4}
+
+# The subfield/year filter, computed once in PostgreSQL so the loader SQL
+# joins a small indexed table instead of repeating the works/topics join.
+# Built in order: the later tables are derived from relevant_works.
+STAGING_TABLES = [
+    ("staging.relevant_works", """
+        SELECT DISTINCT w.id
+        FROM openalex.works w
+        JOIN openalex.works_topics wt ON w.id = wt.work_id
+        JOIN openalex.topics t ON wt.topic_id = t.id
+        WHERE t.subfield_id = 'https://openalex.org/subfields/2507'
+        AND w.publication_year = 2024"""),
+    ("staging.relevant_authors", """
+        SELECT DISTINCT wa.author_id AS id
+        FROM openalex.works_authorships wa
+        JOIN staging.relevant_works rw ON wa.work_id = rw.id
+        WHERE wa.author_id IS NOT NULL"""),
+    ("staging.relevant_institutions", """
+        SELECT DISTINCT wa.institution_id AS id
+        FROM openalex.works_authorships wa
+        JOIN staging.relevant_works rw ON wa.work_id = rw.id
+        WHERE wa.institution_id IS NOT NULL"""),
+    ("staging.relevant_sources", """
+        SELECT DISTINCT wpl.source_id AS id
+        FROM openalex.works_primary_locations wpl
+        JOIN staging.relevant_works rw ON wpl.work_id = rw.id
+        WHERE wpl.source_id IS NOT NULL"""),
+]
+# Pass --force (to a loader or to run_all.py) to reload steps that
+# needs_load() would otherwise skip
+FORCE_LOAD = '--force' in sys.argv[1:]
+
+# Driver pool and retry settings (see make_driver); the pool has to cover
+# every concurrent loader, shard and read session in a run_all stage
+NEO4J_POOL_SIZE = int(os.getenv('NEO4J_POOL_SIZE', '100'))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv('NEO4J_ACQUISITION_TIMEOUT', '120'))
+NEO4J_RETRY_TIME = float(os.getenv('NEO4J_RETRY_TIME', '60'))
+
+# work_mem for the bolt transport's source queries, so the GROUP BY / DISTINCT
+# of the relationship SELECTs hashes in memory instead of spilling to disk
+PG_WORK_MEM = os.getenv('PG_WORK_MEM', '256MB')
+
+# Shared PostgreSQL pool size when run_all passes one in (see make_pg_pool).
+# Every bolt shard holds a pooled connection for its whole stream, and the
+# busiest stage (07 with 08) runs two run_sharded loads of DEFAULT_SHARDS
+# each, so the pool covers both plus PG_POOL_SLACK connections for the short
+# needs_load / pg_count / staging queries around them; a smaller pool makes
+# the extra shards time out waiting (PoolTimeout) on many-core hosts
+PG_POOL_MIN_SIZE = 2
+PG_POOL_SLACK = 4
+PG_POOL_MAX_SIZE = max(16, 2 * DEFAULT_SHARDS + PG_POOL_SLACK)
+
+
+def make_driver(**options):
+    """
+    Create a Neo4j driver with longer timeouts for large operations
+    
+    options override the defaults below (which come from NEO4J_POOL_SIZE,
+    NEO4J_ACQUISITION_TIMEOUT and NEO4J_RETRY_TIME).
+    """
+    config = dict(
+        max_connection_pool_size=NEO4J_POOL_SIZE,
+        connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+        max_transaction_retry_time=NEO4J_RETRY_TIME,  # retries of execute_write
+        connection_timeout=30.0,  # 30 seconds for connection
+        max_connection_lifetime=14410,  # 4 hour max connection lifetime
+        keep_alive=True,  # TCP keepalive on idle pooled connections
+    )
+    config.update(options)
+    return GraphDatabase.driver(
+        os.getenv('NEO4J_URI'),
+        auth=(os.getenv('NEO4J_USER'), os.getenv('NEO4J_PASSWORD')),
+        **config
+    )
+
+
+def rel_batch_size(rel_type, default=REL_BATCH_SIZE):
+    """
+    Rows per batch for one relationship type
+    
+    REL_BATCH_SIZE_<rel_type> (e.g. REL_BATCH_SIZE_CITED) overrides the
+    loader's default, so each type can be tuned from its logged timeTaken.
+    """
+    return int(os.getenv(f'REL_BATCH_SIZE_{rel_type}', default))
+
+
+def make_pg_pool():
+    """Open a PostgreSQL connection pool for loaders that share one"""
+    return ConnectionPool(
+        kwargs=dict(
+            host=os.getenv('PG_HOST'),
+            port=os.getenv('PG_PORT'),
+            dbname=os.getenv('PG_DATABASE'),
+            user=os.getenv('PG_USER'),
+            password=os.getenv('PG_PASSWORD')
+        ),
+        min_size=PG_POOL_MIN_SIZE,
+        max_size=PG_POOL_MAX_SIZE,
+        open=True
+    )
+
 
 class BaseLoader:
     """Base class for all APOC loading scripts"""
     
-    def __init__(self, script_name):
+    # The memory check runs once per process, not once per step
+    memory_checked = False
+    
+    # Set by run_all.py once its own pre-flight passed; each step's
+    # verify_prerequisites and test_connection then return at once
+    preflight_done = False
+    
+    def __init__(self, script_name, driver=None, pg_pool=None):
+        """
+        driver and pg_pool are shared connections owned by the caller
+        (run_all.py); without them the loader opens its own driver and
+        direct PostgreSQL connections, as when a script runs standalone.
+        """
         self.script_name = script_name
-        self.driver = GraphDatabase.driver(
-            os.getenv('NEO4J_URI'),
-            auth=(os.getenv('NEO4J_USER'), os.getenv('NEO4J_PASSWORD'))
-        )
+        self.owns_driver = driver is None
+        self.driver = make_driver() if driver is None else driver
+        self.pg_pool = pg_pool
+        self._read_session = None
         
         # Build JDBC URL
+        # defaultRowFetchSize makes PgJDBC stream through a server-side cursor
+        # (its default fetches the whole result into the JVM heap first), and
+        # prepareThreshold=1 prepares each loader query server-side at once
         self.jdbc_url = (
             f"jdbc:postgresql://{os.getenv('PG_HOST')}:{os.getenv('PG_PORT')}/"
             f"{os.getenv('PG_DATABASE')}?user={os.getenv('PG_USER')}"
             f"&password={os.getenv('PG_PASSWORD')}"
+            f"&defaultRowFetchSize={JDBC_FETCH_SIZE}&prepareThreshold=1"
         )
         
         print(f"\n{'='*80}")
@@ -34,24 +227,56 @@ class BaseLoader:
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Neo4j: {os.getenv('NEO4J_URI')}")
         print(f"PostgreSQL: {os.getenv('PG_HOST')}:{os.getenv('PG_PORT')}/{os.getenv('PG_DATABASE')}")
+        print(f"Transport: {LOAD_TRANSPORT}")
+        print(f"Batch size: {BATCH_SIZE:,} (nodes), {REL_BATCH_SIZE:,} (relationships)")
     
     def close(self):
-        """Close Neo4j connection"""
+        """Close Neo4j connection (a shared driver is left to its owner)"""
+        if self._read_session is not None:
+            self._read_session.close()
+            self._read_session = None
+        if not self.owns_driver:
+            return
         self.driver.close()
         print(f"\nConnection closed.")
     
-    def run_query(self, query, description=None):
-        """Execute a Cypher query and return results"""
+    def read_session(self):
+        """
+        The loader's read session, opened on first use
+        
+        run_query and run_summary_query share it, so a run of verification
+        queries keeps one pooled connection instead of acquiring and
+        releasing one per query. They go through execute_read, which routes
+        to a follower in a cluster and retries transient failures. Like
+        every session it must stay on the thread that uses the loader;
+        writes keep their own sessions.
+        """
+        if self._read_session is None:
+            self._read_session = self.driver.session(default_access_mode=READ_ACCESS)
+        return self._read_session
+    
+    def run_query(self, query, description=None, limit=RUN_QUERY_LIMIT):
+        """
+        Execute a Cypher query and return results
+        
+        Keeps at most limit records; anything past that is discarded by
+        result.consume() instead of being buffered in the driver.
+        
+        Returns:
+            (records, summary)
+        """
         if description:
             print(f"\n{description}")
         
         print(f"Executing query...")
         start_time = time.time()
         
-        with self.driver.session() as session:
-            result = session.run(query)
-            records = list(result)
-            summary = result.consume()
+        def read(tx):
+            result = tx.run(query)
+            records = list(itertools.islice(result, limit))
+            return records, result.peek() is not None, result.consume()
+        
+        records, truncated, summary = self.read_session().execute_read(read)
         
         elapsed = time.time() - start_time
         print(f"✓ Completed in {elapsed:.2f}s")
@@ -61,11 +286,402 @@ class BaseLoader:
             for record in records:
                 record_dict = dict(record)
                 print(f"  Result: {record_dict}")
+        if truncated:
+            print(f"⚠ Result truncated to the first {limit:,} records")
         
         return records, summary
     
+    def run_summary_query(self, query, description=None, **params):
+        """
+        Execute a Cypher query that returns one summary row (counts etc.)
+        
+        Takes the row with result.single() instead of materializing the
+        result; the driver warns if the query returns more than one row.
+        
+        Returns:
+            The row as a dict, or None if the query returned no rows
+        """
+        if description:
+            print(f"\n{description}")
+        
+        print(f"Executing query...")
+        start_time = time.time()
+        
+        record = self.read_session().execute_read(lambda tx: tx.run(query, **params).single())
+        
+        elapsed = time.time() - start_time
+        print(f"✓ Completed in {elapsed:.2f}s")
+        
+        if record is None:
+            return None
+        print(f"  Result: {record.data()}")
+        return record.data()
+    
+    def load(self, sql, cypher, batch_size=REL_BATCH_SIZE, parallel=False, timeout=None,
+             transport=None, bolt_batch_size=BOLT_BATCH_SIZE, **apoc_config):
+        """
+        Run cypher once per row of sql, on the configured transport
+        
+        cypher refers to the source row as `row`. transport overrides
+        LOAD_TRANSPORT for this call. batch_size and timeout (seconds, for
+        the outer statement) apply to the APOC and tx transports; parallel
+        and any extra apoc_config (concurrency, retries, ...) only to APOC;
+        bolt_batch_size is the rows per UNWIND transaction on bolt.
+        
+        Raises RuntimeError when APOC reports failed batches.
+        
+        Returns:
+            List of result dicts (batches, total, errorMessages)
+        """
+        transport = transport or LOAD_TRANSPORT
+        if transport == 'bolt':
+            return [self.stream_upsert(sql, cypher, bolt_batch_size)]
+        
+        if transport == 'tx':
+            query = Query(JDBC_IN_TRANSACTIONS_HEAD + cypher + JDBC_IN_TRANSACTIONS_TAIL, timeout=timeout)
+            with self.driver.session() as session:
+                total = session.run(
+                    query, jdbc_url=self.jdbc_url, sql_query=sql, batch_size=batch_size
+                ).single()["total"]
+            # A failing batch raises instead of being collected
+            return [{'batches': -(-total // batch_size), 'total': total, 'errorMessages': {}}]
+        
+        config = dict(
+            batchSize=batch_size,
+            parallel=parallel,
+            params={'jdbc_url': self.jdbc_url, 'sql_query': sql},
+            **apoc_config
+        )
+        with self.driver.session() as session:
+            result = session.run(Query(APOC_ITERATE, timeout=timeout), cypher=cypher, config=config).single().data()
+        
+        # apoc.periodic.iterate reports failed batches (after any retries)
+        # instead of raising; fail the step here, before record_load marks
+        # it finished, so the next run loads it again
+        if result['failedBatches'] or result['failedOperations'] or result['errorMessages']:
+            print(f"✗ {result['failedBatches']:,} of {result['batches']:,} batches failed "
+                  f"({result['failedOperations']:,} rows)")
+            for message, count in result['errorMessages'].items():
+                print(f"  {count:,}x {message}")
+            raise RuntimeError(f"{result['failedBatches']:,} APOC batches failed")
+        return [result]
+    
+    @staticmethod
+    def _to_neo4j(value):
+        """Convert a PostgreSQL value into something Neo4j can store as a property"""
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, dict):
+            return json.dumps(value)
+        if isinstance(value, list) and any(isinstance(v, (dict, list)) for v in value):
+            return json.dumps(value)
+        return value
+    
+    def stream_upsert(self, sql, cypher, batch_size=BOLT_BATCH_SIZE):
+        """
+        Stream sql through a server-side cursor into UNWIND-batched writes
+        
+        Each batch of rows is sent as $rows to `UNWIND $rows AS row <cypher>`
+        in its own write transaction, so rows cross PostgreSQL -> Python ->
+        Neo4j once with no JDBC hop inside the Neo4j JVM.
+        
+        Returns:
+            Result dict shaped like the APOC one (batches, total, timeTaken
+            in seconds, errorMessages)
+        """
+        statement = f"UNWIND $rows AS row\n{cypher}"
+        batches = total = 0
+        start_time = time.time()
+        
+        with self.driver.session() as session:
+            for chunk in self.source_batches(sql, batch_size):
+                session.execute_write(lambda tx: tx.run(statement, rows=chunk).consume())
+                batches += 1
+                total += len(chunk)
+        
+        return {'batches': batches, 'total': total,
+                'timeTaken': round(time.time() - start_time), 'errorMessages': {}}
+    
+    def source_batches(self, sql, batch_size):
+        """
+        Yield the rows of sql as lists of Neo4j-ready dicts
+        
+        Rows come from a server-side cursor, batch_size at a time. With
+        SNAPSHOT_DIR set, the first read of a query also writes its batches
+        to <SNAPSHOT_DIR>/<sha256 of sql>.pkl.gz, and later reads replay
+        that file (in the batch size it was written with) without touching
+        PostgreSQL. Delete the directory to pick up new source data.
+        """
+        snapshot = None
+        if SNAPSHOT_DIR:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            snapshot = os.path.join(SNAPSHOT_DIR, hashlib.sha256(sql.encode()).hexdigest() + '.pkl.gz')
+            if os.path.exists(snapshot):
+                print(f"  ○ Replaying {snapshot}")
+                with gzip.open(snapshot, 'rb') as f:
+                    while True:
+                        try:
+                            yield pickle.load(f)
+                        except EOFError:
+                            return
+        
+        # Written under a temporary name, so an interrupted read never
+        # leaves a partial snapshot behind to be replayed
+        out = gzip.open(snapshot + '.tmp', 'wb', compresslevel=1) if snapshot else None
+        try:
+            with self.pg_connect() as conn:
+                # Local to this transaction, so a pooled connection goes back unchanged
+                conn.execute("SELECT set_config('work_mem', %s, true)", (PG_WORK_MEM,))
+                with conn.cursor(name="stream_upsert", row_factory=dict_row) as cur:
+                    cur.itersize = batch_size
+                    cur.execute(sql)
+                    while True:
+                        rows = cur.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        # NULL columns are left out: row.x is null for a missing
+                        # key anyway, and the batch shrinks on the wire
+                        chunk = [
+                            {k: self._to_neo4j(v) for k, v in row.items() if v is not None}
+                            for row in rows
+                        ]
+                        if out:
+                            pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+                        yield chunk
+        finally:
+            if out:
+                out.close()
+        
+        if snapshot:
+            os.replace(snapshot + '.tmp', snapshot)
+    
+    def run_sharded(self, sql_template, shard_key, cypher, n_shards=DEFAULT_SHARDS, **load_options):
+        """
+        Run a load as n_shards concurrent invocations over disjoint rows
+        
+        sql_template is the source SELECT with a {shard_filter} placeholder,
+        filled with a hash-partition predicate on shard_key. Rows for one
+        key value always land in the same shard, so no two shards MERGE
+        relationships on the same node for that side; each shard runs
+        serially on its own session.
+        
+        Returns:
+            The result dicts of every shard, in shard order
+        """
+        print(f"Running {n_shards} shards on {shard_key}...")
+        
+        def run_shard(shard):
+            shard_filter = f"AND {self._hash_group(shard_key, n_shards)} = {shard}"
+            return self.load(sql_template.format(shard_filter=shard_filter), cypher, **load_options)
+        
+        with ThreadPoolExecutor(max_workers=n_shards) as executor:
+            shard_records = list(executor.map(run_shard, range(n_shards)))
+        
+        return [record for records in shard_records for record in records]
+    
+    @staticmethod
+    def _hash_group(key, n_groups):
+        """SQL expression putting each value of key into one of n_groups groups"""
+        return f"abs(hashtext({key})::bigint) % {n_groups}"
+    
+    @staticmethod
+    def _pair_rounds(n_groups):
+        """
+        Split every unordered pair of groups into rounds of disjoint pairs
+        
+        Round-robin (circle method) over the distinct pairs, then one round
+        of the n_groups (i, i) pairs; no group appears twice in a round.
+        """
+        groups = list(range(n_groups)) + ([None] if n_groups % 2 else [])
+        rounds = []
+        for _ in range(len(groups) - 1):
+            half = len(groups) // 2
+            pairs = zip(groups[:half], reversed(groups[half:]))
+            rounds.append([(i, j) for i, j in pairs if i is not None and j is not None])
+            groups.insert(1, groups.pop())
+        rounds.append([(i, i) for i in range(n_groups)])
+        return rounds
+    
+    def run_binned(self, sql_template, start_key, end_key, cypher, n_groups=DEFAULT_SHARDS, **load_options):
+        """
+        Run a load between two nodes of the same label in lock-free rounds
+        
+        run_sharded can't keep shards apart when both endpoints share a
+        label: a Work locked as the citing side in one shard can be the
+        cited side in another. Here both keys are hashed into n_groups
+        groups; each round runs the group pairs from _pair_rounds side by
+        side, and the invocation for pair {i, j} takes only rows between
+        groups i and j, so no two concurrent invocations touch the same
+        node. sql_template has a {shard_filter} placeholder, as for
+        run_sharded.
+        
+        Returns:
+            The result dicts of every invocation, in round order
+        """
+        start_group = self._hash_group(start_key, n_groups)
+        end_group = self._hash_group(end_key, n_groups)
+        rounds = self._pair_rounds(n_groups)
+        print(f"Running {len(rounds)} rounds over {n_groups} groups on {start_key} / {end_key}...")
+        
+        def run_pair(pair):
+            i, j = pair
+            shard_filter = f"AND ({start_group}, {end_group}) IN (({i}, {j}), ({j}, {i}))"
+            return self.load(sql_template.format(shard_filter=shard_filter), cypher, **load_options)
+        
+        all_records = []
+        for n, pairs in enumerate(rounds, 1):
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=len(pairs)) as executor:
+                for records in executor.map(run_pair, pairs):
+                    all_records.extend(records)
+            print(f"  ✓ Round {n}/{len(rounds)} ({len(pairs)} pairs) in {time.time() - start_time:.2f}s")
+        
+        return all_records
+    
+    def pg_connect(self):
+        """
+        Get a direct PostgreSQL connection (for DDL, outside APOC/JDBC)
+        
+        Use as a context manager: the connection commits on exit and, when
+        it came from the shared pool, goes back to it.
+        """
+        if self.pg_pool is not None:
+            return self.pg_pool.connection()
+        return psycopg.connect(
+            host=os.getenv('PG_HOST'),
+            port=os.getenv('PG_PORT'),
+            dbname=os.getenv('PG_DATABASE'),
+            user=os.getenv('PG_USER'),
+            password=os.getenv('PG_PASSWORD')
+        )
+    
+    def ensure_relevant_works(self, rebuild=False):
+        """
+        Create the staging.relevant_* filter tables in PostgreSQL
+        
+        Without rebuild, existing non-empty tables are kept, so standalone
+        loader runs reuse what step 00 built. With rebuild they are dropped
+        and recomputed in one transaction.
+        """
+        print("\nPreparing staging filter tables in PostgreSQL...")
+        start_time = time.time()
+        
+        with self.pg_connect() as conn, conn.cursor() as cur:
+            cur.execute("CREATE SCHEMA IF NOT EXISTS staging")
+            for table, select in STAGING_TABLES:
+                if rebuild:
+                    cur.execute(f"DROP TABLE IF EXISTS {table}")
+                cur.execute("SELECT to_regclass(%s)", (table,))
+                if cur.fetchone()[0] is not None:
+                    # Crash recovery truncates UNLOGGED tables: rebuild an empty one
+                    if cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]:
+                        print(f"  ○ {table} already exists")
+                        continue
+                    cur.execute(f"DROP TABLE {table}")
+                # UNLOGGED: a rebuildable filter needs no WAL, and unlike a TEMP
+                # table it is still visible to APOC's own JDBC connections
+                cur.execute(f"CREATE UNLOGGED TABLE {table} AS {select}")
+                cur.execute(f"CREATE UNIQUE INDEX ON {table} (id)")
+                cur.execute(f"ANALYZE {table}")
+                print(f"  ✓ {table}: {cur.execute(f'SELECT count(*) FROM {table}').fetchone()[0]:,} rows")
+        
+        print(f"✓ Staging tables ready in {time.time() - start_time:.2f}s")
+    
+    def record_load(self, records, step=None):
+        """
+        Record a finished load as one (:LoadRun) provenance node
+        
+        Stands in for a per-row loaded_at/created_at = datetime() write:
+        the timestamp is computed once in Python and stored once per step.
+        step defaults to this script's name.
+        """
+        loaded_at = datetime.now(timezone.utc).isoformat()
+        rows = sum(record.get('total') or 0 for record in records)
+        query = "CREATE (:LoadRun {step: $step, at: datetime($loaded_at), rows: $rows})"
+        step = step or self.script_name
+        
+        with self.driver.session() as session:
+            session.execute_write(
+                lambda tx: tx.run(query, step=step, loaded_at=loaded_at, rows=rows).consume()
+            )
+        print(f"✓ Recorded LoadRun at {loaded_at} ({rows:,} rows)")
+    
+    def pg_count(self, from_item):
+        """Count the rows of a PostgreSQL FROM item (table, join or subquery)"""
+        with self.pg_connect() as conn, conn.cursor() as cur:
+            return cur.execute(f"SELECT count(*) FROM {from_item}").fetchone()[0]
+    
+    def needs_load(self, count_query, expected_min_count=1):
+        """
+        Decide whether this step's load has to run
+        
+        The load is skipped when an earlier run of this step finished (it
+        left a (:LoadRun), see record_load) and count_query, a Cypher count
+        returned as `n`, already reaches expected_min_count. Reruns then
+        cost two count queries instead of replaying every MERGE.
+        
+        Returns:
+            True if the step should load, always with --force
+        """
+        if FORCE_LOAD:
+            return True
+        
+        session = self.read_session()
+        finished = session.execute_read(lambda tx: tx.run(
+            "MATCH (r:LoadRun {step: $step}) RETURN count(r) AS n", step=self.script_name
+        ).single()["n"])
+        if not finished:
+            return True
+        current = session.execute_read(lambda tx: tx.run(count_query).single()["n"])
+        
+        if current < expected_min_count:
+            print(f"○ {current:,} of {expected_min_count:,} expected present, loading")
+            return True
+        
+        print(f"○ Already loaded ({current:,} present), skipping - pass --force to reload")
+        return False
+    
+    def ensure_unique_constraint(self, label, prop="id"):
+        """
+        Make sure MERGE on (:label {prop}) is backed by a uniqueness constraint
+        
+        Parallel node loaders rely on it: MERGE then does an index seek and
+        locks only the key it writes, instead of label-scanning per row.
+        Uses the same names as 00_setup_schema.py, so this is a no-op there.
+        """
+        query = (
+            f"CREATE CONSTRAINT {label.lower()}_{prop} IF NOT EXISTS "
+            f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+        )
+        try:
+            with self.driver.session() as session:
+                session.run(query).consume()
+        except Neo4jError as e:
+            # Same rule already present under another name
+            if e.code != "Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists":
+                raise
+        print(f"✓ Uniqueness constraint on :{label}({prop}) in place")
+    
+    def warmup(self, label, prop="id"):
+        """
+        Pull the :label(prop) index into the page cache before a load
+        
+        A relationship load seeks its endpoints by id from the first batch
+        on; reading the whole index once up front means those seeks hit
+        cached pages instead of faulting them in batch by batch. The IS NOT
+        NULL predicate makes the planner scan the index, and the count is
+        taken from index entries without touching the node store.
+        """
+        start_time = time.time()
+        query = f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL RETURN count(n.{prop}) AS n"
+        count = self.read_session().execute_read(lambda tx: tx.run(query).single()["n"])
+        print(f"✓ Warmed :{label}({prop}) index ({count:,} entries) in {time.time() - start_time:.2f}s")
+    
     def verify_prerequisites(self):
         """Check that required environment variables are set"""
+        if BaseLoader.preflight_done:
+            return True
+        
         required_vars = [
             'NEO4J_URI', 'NEO4J_USER', 'NEO4J_PASSWORD',
             'PG_HOST', 'PG_PORT', 'PG_DATABASE', 'PG_USER', 'PG_PASSWORD'
@@ -82,16 +698,51 @@ class BaseLoader:
     
     def test_connection(self):
         """Test Neo4j connection"""
+        if BaseLoader.preflight_done:
+            return True
+        
         try:
             with self.driver.session() as session:
                 result = session.run("RETURN 1 as test")
                 result.single()
-            print("✓ Neo4j connection successful")
+                print("✓ Neo4j connection successful")
+                if not BaseLoader.memory_checked:
+                    BaseLoader.memory_checked = True
+                    self.check_memory_settings(session)
             return True
         except Exception as e:
             print(f"✗ Neo4j connection failed: {e}")
             return False
     
+    @staticmethod
+    def _parse_size(value):
+        """Parse a Neo4j memory setting ("512m", "4.00GiB", "0") into bytes"""
+        match = re.fullmatch(r'([\d.]+)\s*([kmgt]?)i?b?', (value or '').strip().lower())
+        if not match:
+            return None
+        return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+    
+    def check_memory_settings(self, session):
+        """Warn when the server's memory settings are below MEMORY_MINIMUMS"""
+        try:
+            result = session.run(
+                "SHOW SETTINGS YIELD name, value WHERE name IN $names RETURN name, value",
+                names=list(MEMORY_MINIMUMS)
+            )
+            settings = {record["name"]: record["value"] for record in result}
+        except Neo4jError:
+            print("○ Cannot read server settings (needs SHOW SETTING privilege), skipping memory check")
+            return
+        
+        for name, minimum in MEMORY_MINIMUMS.items():
+            value = settings.get(name)
+            size = self._parse_size(value)
+            if size == 0 and name.startswith('db.memory.transaction'):
+                print(f"⚠ {name} is unlimited: one large batch can exhaust the heap (see neo4j.conf.snippet)")
+            elif size is None or size < minimum:
+                print(f"⚠ {name} = {value or 'unset'}, below the recommended "
+                      f"{minimum // 1024**2:,} MiB (see neo4j.conf.snippet)")
+    
     def print_summary(self, total_time):
         """Print completion summary"""
         print(f"\n{'='*80}")
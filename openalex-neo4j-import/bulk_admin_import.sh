@@ -0,0 +1,34 @@
+#!/usr/bin/env bash
+# ============================================================================
+# bulk_admin_import.sh
+# Offline bulk import of the files written by bulk_export_csv.py
+# ============================================================================
+# Cold start only: Neo4j must be STOPPED and the target database empty (or
+# pass --overwrite-destination to replace it). Extra arguments are passed
+# through to neo4j-admin.
+#
+# Afterwards: start Neo4j and run 00_setup_schema.py to create the
+# constraints and indexes. Use the 01-10 loaders for incremental updates.
+# ============================================================================
+set -euo pipefail
+
+DIR="${BULK_DIR:-$(dirname "$0")/bulk_import}"
+DATABASE="${NEO4J_DATABASE:-neo4j}"
+
+neo4j-admin database import full "$DATABASE" \
+    --nodes=Work="$DIR/works-header.csv,$DIR/works.csv.gz" \
+    --nodes=Author="$DIR/authors-header.csv,$DIR/authors.csv.gz" \
+    --nodes=Institution="$DIR/institutions-header.csv,$DIR/institutions.csv.gz" \
+    --nodes=Topic="$DIR/topics-header.csv,$DIR/topics.csv.gz" \
+    --nodes=Source="$DIR/sources-header.csv,$DIR/sources.csv.gz" \
+    --relationships=AUTHORED="$DIR/authored-header.csv,$DIR/authored.csv.gz" \
+    --relationships=AFFILIATED_WITH="$DIR/affiliated_with-header.csv,$DIR/affiliated_with.csv.gz" \
+    --relationships=TAGGED_WITH="$DIR/tagged_with-header.csv,$DIR/tagged_with.csv.gz" \
+    --relationships=PUBLISHED_IN="$DIR/published_in-header.csv,$DIR/published_in.csv.gz" \
+    --relationships=CITED="$DIR/cited-header.csv,$DIR/cited.csv.gz" \
+    --skip-duplicate-nodes=true \
+    --skip-bad-relationships=true \
+    --high-parallel-io=on \
+    "$@"
+
+echo "✓ Import complete. Start Neo4j, then run: python 00_setup_schema.py"
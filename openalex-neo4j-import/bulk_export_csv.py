@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+bulk_export_csv.py
+Export nodes and relationships as gzipped CSVs for `neo4j-admin database import`
+Cold-start path: run this, then bulk_admin_import.sh, against an EMPTY database
+The 00-10 loaders stay the incremental (MERGE) path for later updates
+Pass file stems (e.g. `python bulk_export_csv.py cited`) to re-export only those
+"""
+import gzip
+import os
+import sys
+import time
+from pathlib import Path
+from base_loader import BaseLoader
+
+# Where the header and data files are written (read by bulk_admin_import.sh)
+BULK_DIR = Path(os.getenv('BULK_DIR', Path(__file__).parent / 'bulk_import'))
+
+# (file stem, neo4j-admin header, SELECT producing the columns in header order)
+# Booleans are cast to text: COPY writes t/f, the importer expects true/false.
+# There is no MERGE in a bulk import, so relationship rows are deduplicated here.
+NODE_EXPORTS = [
+    ("works",
+     "id:ID(Work),doi,title,display_name,publication_year:int,publication_date:date,type,"
+     "cited_by_count:int,is_retracted:boolean,is_paratext:boolean,language",
+     """SELECT w.id, w.doi, w.title, w.display_name, w.publication_year,
+                w.publication_date, w.type, w.cited_by_count,
+                COALESCE(w.is_retracted, false)::text, COALESCE(w.is_paratext, false)::text,
+                w.language
+         FROM staging.relevant_works rw
+         JOIN openalex.works w ON w.id = rw.id"""),
+    ("authors",
+     "id:ID(Author),orcid,display_name,display_name_alternatives,works_count:int,"
+     "cited_by_count:int",
+     """SELECT a.id, a.orcid, a.display_name, a.display_name_alternatives,
+                a.works_count, a.cited_by_count
+         FROM staging.relevant_authors ra
+         JOIN openalex.authors a ON a.id = ra.id"""),
+    ("institutions",
+     "id:ID(Institution),ror,display_name,country_code,type,homepage_url,works_count:int,"
+     "cited_by_count:int",
+     """SELECT i.id, i.ror, i.display_name, i.country_code, i.type,
+                i.homepage_url, i.works_count, i.cited_by_count
+         FROM staging.relevant_institutions ri
+         JOIN openalex.institutions i ON i.id = ri.id"""),
+    ("topics",
+     "id:ID(Topic),display_name,subfield_id,subfield_display_name,field_id,field_display_name,"
+     "domain_id,domain_display_name,description,keywords,works_count:int,cited_by_count:int",
+     """SELECT t.id, t.display_name, t.subfield_id, t.subfield_display_name,
+                t.field_id, t.field_display_name, t.domain_id, t.domain_display_name,
+                t.description, t.keywords, t.works_count, t.cited_by_count
+         FROM openalex.topics t
+         WHERE EXISTS (
+             SELECT 1
+             FROM openalex.works_topics wt
+             JOIN staging.relevant_works rw ON wt.work_id = rw.id
+             WHERE wt.topic_id = t.id
+         )"""),
+    ("sources",
+     "id:ID(Source),issn_l,issn,display_name,publisher,works_count:int,cited_by_count:int,"
+     "is_oa:boolean,is_in_doaj:boolean,homepage_url",
+     """SELECT s.id, s.issn_l, s.issn, s.display_name, s.publisher,
+                s.works_count, s.cited_by_count, s.is_oa::text, s.is_in_doaj::text,
+                s.homepage_url
+         FROM staging.relevant_sources rs
+         JOIN openalex.sources s ON s.id = rs.id"""),
+]
+
+RELATIONSHIP_EXPORTS = [
+    ("authored",
+     ":START_ID(Author),:END_ID(Work),author_position,institution_id",
+     """SELECT DISTINCT ON (wa.author_id, wa.work_id)
+                wa.author_id, wa.work_id, wa.author_position, wa.institution_id
+         FROM openalex.works_authorships wa
+         JOIN staging.relevant_works rw ON wa.work_id = rw.id
+         WHERE wa.author_id IS NOT NULL"""),
+    ("affiliated_with",
+     ":START_ID(Author),:END_ID(Institution),first_seen:int,last_seen:int",
+     """SELECT wa.author_id, wa.institution_id,
+               min(w.publication_year), max(w.publication_year)
+        FROM openalex.works_authorships wa
+        JOIN staging.relevant_works rw ON wa.work_id = rw.id
+        JOIN openalex.works w ON wa.work_id = w.id
+        WHERE wa.author_id IS NOT NULL
+        AND wa.institution_id IS NOT NULL
+        GROUP BY wa.author_id, wa.institution_id"""),
+    ("tagged_with",
+     ":START_ID(Work),:END_ID(Topic),score:float",
+     """SELECT DISTINCT ON (wt.work_id, wt.topic_id)
+                wt.work_id, wt.topic_id, wt.score
+         FROM openalex.works_topics wt
+         JOIN staging.relevant_works rw ON wt.work_id = rw.id
+         WHERE wt.topic_id IS NOT NULL"""),
+    ("published_in",
+     ":START_ID(Work),:END_ID(Source),is_oa:boolean,version",
+     """SELECT DISTINCT ON (wpl.work_id, wpl.source_id)
+                wpl.work_id, wpl.source_id, wpl.is_oa::text, wpl.version
+         FROM openalex.works_primary_locations wpl
+         JOIN staging.relevant_works rw ON wpl.work_id = rw.id
+         WHERE wpl.source_id IS NOT NULL"""),
+    ("cited",
+     ":START_ID(Work),:END_ID(Work),citation_type",
+     """SELECT DISTINCT rw.work_id, rw.referenced_work_id, 'internal'
+         FROM openalex.works_referenced_works rw
+         JOIN staging.relevant_works citing ON rw.work_id = citing.id
+         JOIN staging.relevant_works cited ON rw.referenced_work_id = cited.id"""),
+]
+
+
+class BulkExporter(BaseLoader):
+    def __init__(self, stems=None, **connections):
+        super().__init__("Bulk Export: PostgreSQL → neo4j-admin CSV", **connections)
+        self.stems = stems
+    
+    def export(self, conn, stem, header, sql):
+        """Write <stem>-header.csv and stream the rows into <stem>.csv.gz"""
+        start_time = time.time()
+        
+        with open(BULK_DIR / f"{stem}-header.csv", 'w') as f:
+            f.write(header + "\n")
+        
+        # The client compresses; COPY ... TO PROGRAM would need superuser
+        # and would write on the database server instead
+        with conn.cursor() as cur, gzip.open(BULK_DIR / f"{stem}.csv.gz", 'wb', compresslevel=1) as f:
+            with cur.copy(f"COPY ({sql}) TO STDOUT WITH (FORMAT CSV)") as copy:
+                for data in copy:
+                    f.write(data)
+            rows = cur.rowcount
+        
+        print(f"  ✓ {stem}: {rows:,} rows in {time.time() - start_time:.2f}s")
+    
+    def run(self):
+        """Export every node and relationship file"""
+        if not self.verify_prerequisites():
+            return False
+        
+        start_time = time.time()
+        
+        try:
+            self.ensure_relevant_works(rebuild=True)
+            BULK_DIR.mkdir(parents=True, exist_ok=True)
+            
+            exports = NODE_EXPORTS + RELATIONSHIP_EXPORTS
+            if self.stems:
+                unknown = set(self.stems) - {stem for stem, _, _ in exports}
+                if unknown:
+                    print(f"✗ Unknown export(s): {', '.join(sorted(unknown))}")
+                    return False
+                exports = [e for e in exports if e[0] in self.stems]
+            
+            print(f"\nExporting to {BULK_DIR}...")
+            with self.pg_connect() as conn:
+                for stem, header, sql in exports:
+                    self.export(conn, stem, header, sql)
+            
+            self.print_summary(time.time() - start_time)
+            return True
+        
+        except Exception as e:
+            print(f"\n✗ ERROR: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+        finally:
+            self.close()
+
+
+def main(**connections):
+    exporter = BulkExporter(stems=[a for a in sys.argv[1:] if not a.startswith('-')], **connections)
+    success = exporter.run()
+    
+    if success:
+        print("\n" + "="*80)
+        print("NEXT STEP: Stop Neo4j and run bulk_admin_import.sh")
+        print("="*80)
+    else:
+        print("\nPlease fix errors before proceeding.")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,16 @@
 """
 run_all.py
 Master script - Runs the complete APOC loading pipeline
-Executes all scripts in order from 00 to 12
+Executes all scripts in order from 00 to 12 (01-05, and 07 with 08, concurrently)
 """
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Import all loader classes
-from base_loader import BaseLoader
+from base_loader import BaseLoader, make_driver, make_pg_pool
 
 # Import individual step modules
 import importlib.util
@@ -22,15 +23,37 @@ def load_module(script_name):
     spec.loader.exec_module(module)
     return module
 
-def run_script(script_name, step_number, total_steps):
-    """Run a single loading script"""
+class Pipeline:
+    """
+    Owns the connections shared by every step
+    
+    One Neo4j driver and one PostgreSQL pool are opened for the whole run
+    and passed to each loader, instead of every script paying for its own
+    Bolt handshake, authentication and pool warm-up.
+    """
+    
+    def __init__(self):
+        self.driver = make_driver()
+        self.pg_pool = make_pg_pool()
+    
+    def connections(self):
+        """Keyword arguments for a loader's main()"""
+        return {'driver': self.driver, 'pg_pool': self.pg_pool}
+    
+    def close(self):
+        self.pg_pool.close()
+        self.driver.close()
+        print(f"\nConnections closed.")
+
+def run_script(script_name, step_number, total_steps, connections):
+    """Run a single loading script on the shared connections"""
     print("\n" + "="*80)
     print(f"RUNNING SCRIPT {step_number}/{total_steps}: {script_name}")
     print("="*80)
     
     try:
         module = load_module(script_name)
-        success = module.main()
+        success = module.main(**connections)
         
         if success is False:
             print(f"\n✗ Script {script_name} failed!")
@@ -50,6 +73,29 @@ def run_script(script_name, step_number, total_steps):
         traceback.print_exc()
         return False
 
+def run_stage(numbered_scripts, total_steps, connections):
+    """
+    Run the (step_number, script_name) pairs of one stage
+    
+    A stage with several scripts runs them concurrently on the shared
+    driver and pool; each loader opens its own sessions, so nothing
+    session-level crosses threads.
+    
+    Returns:
+        The (step_number, script_name) pairs that failed
+    """
+    def run(item):
+        step_number, script_name = item
+        return run_script(script_name, step_number, total_steps, connections)
+    
+    if len(numbered_scripts) == 1:
+        results = [run(numbered_scripts[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(numbered_scripts)) as executor:
+            results = list(executor.map(run, numbered_scripts))
+    
+    return [item for item, success in zip(numbered_scripts, results) if not success]
+
 def main():
     """Run the complete pipeline"""
     print("="*80)
@@ -58,53 +104,73 @@ def main():
     print("="*80)
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    # Check environment
+    # Check environment and Neo4j once for the whole run
     base = BaseLoader("Pre-flight Check")
-    if not base.verify_prerequisites():
+    if not base.verify_prerequisites() or not base.test_connection():
         print("\n✗ Environment check failed. Please fix errors and try again.")
         base.close()
         return False
     base.close()
     
     print("\n✓ Environment check passed")
+    BaseLoader.preflight_done = True
     
-    # Define pipeline steps
-    scripts_raw = [
-        "00_setup_schema.py",
-        "01_load_works.py",
-        "02_load_authors.py",
-        "03_load_institutions.py",
-        "04_load_topics.py",
-        "05_load_sources.py",
-        "06_load_authored.py",
-        "07_load_affiliated_with.py",
-        "08_load_tagged_with.py",
-        "09_load_published_in.py",
-        "10_load_cited.py",
-        # "11_load_related_to.py",
-        "12_verify_graph.py"
+    pipeline = Pipeline()
+    try:
+        return run_pipeline(pipeline.connections())
+    finally:
+        pipeline.close()
+
+def run_pipeline(connections):
+    """Run every step in order on the shared connections"""
+    # Define pipeline stages; a stage starts once the previous one finished
+    stages_raw = [
+        ["00_setup_schema.py"],
+        # Node loaders don't depend on each other, so they run side by side
+        [
+            "01_load_works.py",
+            "02_load_authors.py",
+            "03_load_institutions.py",
+            "04_load_topics.py",
+            "05_load_sources.py",
+        ],
+        ["06_load_authored.py"],
+        # 07 locks only Authors and Institutions, 08 Works and Topics, so the
+        # two never wait on each other; 07 also needs 06's AUTHORED for
+        # paper_count. Every other relationship step locks Works, so those
+        # stay one per stage rather than deadlocking across steps
+        [
+            "07_load_affiliated_with.py",
+            "08_load_tagged_with.py",
+        ],
+        ["09_load_published_in.py"],
+        ["10_load_cited.py"],
+        # ["11_load_related_to.py"],
+        ["12_verify_graph.py"]
     ]
     
     folder = "openalex-neo4j-import/"
 
-    scripts = [folder + script for script in scripts_raw]
+    stages = [[folder + script for script in stage] for stage in stages_raw]
 
-    total_steps = len(scripts)
+    total_steps = sum(len(stage) for stage in stages)
     pipeline_start = time.time()
     
-    # Run each script
-    for i, script in enumerate(scripts, 1):
-        if not run_script(script, i, total_steps):
+    # Run each stage
+    step = 0
+    for stage in stages:
+        numbered = [(step + i, script) for i, script in enumerate(stage, 1)]
+        step += len(stage)
+        
+        failed = run_stage(numbered, total_steps, connections)
+        if failed:
             print("\n" + "="*80)
             print("✗ PIPELINE FAILED")
             print("="*80)
-            print(f"Failed at step {i}/{total_steps}: {script}")
+            for i, script in failed:
+                print(f"Failed at step {i}/{total_steps}: {script}")
             print(f"Total time before failure: {(time.time() - pipeline_start)/60:.2f} minutes")
             return False
-        
-        # Brief pause between scripts
-        if i < total_steps:
-            time.sleep(2)
     
     # Pipeline completed successfully
     total_time = time.time() - pipeline_start